@@ -1,10 +1,16 @@
 import asyncio
+import logging
 from typing import Dict, Any, List, Tuple
 from .schemas import Workflow, NodeConfig, Edge
 
 from .node_registry import registry
 from pocketflow import Flow, Node
 from .nodes.base import BasePlatformNode
+from .nodes.llm import LLMNode
+from .nodes.vector_memory import VectorMemoryNode
+from .nodes.web import WebFetchNode
+
+logger = logging.getLogger(__name__)
 
 class BranchNode(BasePlatformNode, Node):
     """
@@ -21,22 +27,128 @@ class BranchNode(BasePlatformNode, Node):
     def prep(self, shared):
         return shared
         
+    # Node types whose sibling branches run together via cls.aexec_many
+    CONCURRENT_TYPES = (LLMNode, WebFetchNode)
+
     def exec(self, prep_res):
+        # LLM branches sharing a batch_group are sent as one request first,
+        # then opted-in LLM and web fetch branches run concurrently
+        batched = self._run_llm_batches(prep_res)
+        batched += self._run_concurrently(prep_res, batched)
+
         # In a real parallel engine we might use threads, 
         # but for PocketFlow we can just run them sequentially 
         # as they share the same 'shared' state.
         for node in self.nodes_to_run:
+            if node in batched:
+                continue
             # We create a mini-flow for each branch to ensure 
             # its successors are also executed correctly.
             flow = Flow(node)
             flow.run(prep_res)
         return "branch_complete"
 
+    def _run_llm_batches(self, shared):
+        """Run LLMNode branches that opt into a batch_group; returns the nodes handled."""
+        groups = {}
+        for node in self.nodes_to_run:
+            if isinstance(node, LLMNode):
+                group = (getattr(node, "config", {}).get("batch_group") or "").strip()
+                if group:
+                    groups.setdefault(group, []).append(node)
+
+        handled = []
+        for peers in groups.values():
+            if len(peers) < 2:
+                continue
+            preps = [node.prep(shared) for node in peers]
+            results = LLMNode.batch_exec(peers, preps)
+            for node, prep_res, exec_res in zip(peers, preps, results):
+                self._continue_branch(node, shared, prep_res, exec_res)
+                handled.append(node)
+        return handled
+
+    def _run_concurrently(self, shared, skip):
+        """
+        Run sibling branches of each CONCURRENT_TYPES class with that class's
+        aexec_many, all on one event loop; returns the nodes handled.
+        """
+        groups = []
+        for cls in self.CONCURRENT_TYPES:
+            peers = [
+                n for n in self.nodes_to_run
+                if isinstance(n, cls) and n not in skip and self._may_run_concurrently(n)
+            ]
+            if len(peers) >= 2:
+                groups.append((cls, peers))
+        if not groups:
+            return []
+        try:
+            asyncio.get_running_loop()
+            # Already inside an event loop: leave them to the sequential path
+            return []
+        except RuntimeError:
+            pass
+
+        preps = [[node.prep(shared) for node in peers] for _, peers in groups]
+
+        async def run_all():
+            return await asyncio.gather(
+                *(cls.aexec_many(peers, p) for (cls, peers), p in zip(groups, preps))
+            )
+
+        handled = []
+        for (_, peers), group_preps, results in zip(groups, preps, asyncio.run(run_all())):
+            for node, prep_res, exec_res in zip(peers, group_preps, results):
+                self._continue_branch(node, shared, prep_res, exec_res)
+            handled.extend(peers)
+        return handled
+
+    @staticmethod
+    def _may_run_concurrently(node):
+        """
+        Concurrent branches are all prepped before any of them runs, so they
+        cannot see each other's results. Branches therefore opt in with
+        "concurrent"; LLM branches never do when they read or write chat
+        history.
+        """
+        cfg = getattr(node, "config", {})
+        if not cfg.get("concurrent"):
+            return False
+        if isinstance(node, LLMNode):
+            return not cfg.get("use_history")
+        return True
+
+    def _continue_branch(self, node, shared, prep_res, exec_res):
+        action = node.post(shared, prep_res, exec_res)
+        # Continue the branch from the node's successor
+        next_node = node.successors.get(action or "default")
+        if next_node:
+            Flow(next_node).run(shared)
+
     def post(self, shared, prep_res, exec_res):
         # We don't want to store 'branch_complete' in results keys
         # as it's a wrapper.
         return None
 
+def run_flow(flow, shared):
+    """Run a built flow, then finish work that nodes deferred to the end of the run."""
+    shared[VectorMemoryNode.DEFER_FLUSH_KEY] = True
+    try:
+        result = flow.run(shared)
+    except BaseException:
+        # Still store what earlier nodes buffered, without masking the error
+        try:
+            VectorMemoryNode.flush_pending(shared)
+        except Exception:
+            logger.exception("Could not flush buffered vector memory adds")
+        raise
+    finally:
+        shared.pop(VectorMemoryNode.DEFER_FLUSH_KEY, None)
+    # Buffered vector memory adds; a failure fails the run
+    VectorMemoryNode.flush_pending(shared)
+    return result
+
 def build_graph(workflow: Workflow, event_callback=None):
     # Mapping from Node ID (frontend) to PocketFlow Node instance
     pf_nodes = {}
@@ -56,7 +168,7 @@ def build_graph(workflow: Workflow, event_callback=None):
         pf_node.id = node_config.id 
         pf_node.on_event = event_callback
         
-        print(f"DEBUG: Created node {pf_node.name} (ID: {node_config.id})")
+        logger.debug("Created node %s (ID: %s)", pf_node.name, node_config.id)
         
         pf_nodes[node_config.id] = pf_node
 
@@ -135,7 +247,7 @@ async def run_workflow(workflow: Workflow, event_callback=None):
     # Run sync for now
     try:
         shared_state = {}
-        await asyncio.to_thread(flow.run, shared_state)
+        await asyncio.to_thread(run_flow, flow, shared_state)
         
         results = shared_state.get("results", {})
         return {"status": "completed", "results": results}
@@ -5,13 +5,13 @@ import uvicorn
 import asyncio
 import importlib
 import os
-import json
 import inspect
 import logging
 from .node_registry import registry
 from .scheduler import SchedulerService
 from .schemas import NodeMetadata, Edge, NodeConfig, Workflow
 from .workspace_manager import WorkspaceManager
+from .nodes import _json
 
 # Setup Logging
 logging.basicConfig(level=logging.INFO)
@@ -21,10 +21,14 @@ app = FastAPI(title="PocketFlow Graph Platform")
 
 # Workspaces & Scheduler
 ROOT_DIR = os.path.dirname(os.path.abspath(__file__))
-workspace_manager = WorkspaceManager(ROOT_DIR)
-# Initial Migration
-legacy_workflows_path = os.path.join(ROOT_DIR, "workflows")
-workspace_manager.migrate_legacy_workflows(legacy_workflows_path)
+# WORKSPACES_ROOT moves the workspaces out of the source tree (tests set it in
+# tests/conftest.py before this module is imported)
+WORKSPACES_ROOT = os.environ.get("WORKSPACES_ROOT")
+workspace_manager = WorkspaceManager(ROOT_DIR, WORKSPACES_ROOT)
+# Initial Migration (only into the in-tree workspaces it was written for)
+if not WORKSPACES_ROOT:
+    legacy_workflows_path = os.path.join(ROOT_DIR, "workflows")
+    workspace_manager.migrate_legacy_workflows(legacy_workflows_path)
 
 # Initialize Scheduler with current workspace
 scheduler = SchedulerService(workspace_manager.get_workflows_dir(workspace_manager.get_current_workspace()))
@@ -32,41 +36,36 @@ scheduler = SchedulerService(workspace_manager.get_workflows_dir(workspace_manag
 # WS Manager
 from .websockets import manager
 
+# Event loop the workflow threads hand their events to
+loop_instance = None
+_drain_task = None
+
 @app.on_event("startup")
 async def startup_event():
+    global loop_instance, _drain_task
+    loop_instance = asyncio.get_running_loop()
+    _drain_task = asyncio.create_task(manager.dispatch_events())
     scheduler.start()
 
 @app.on_event("shutdown")
 async def shutdown_event():
     scheduler.stop()
-
-# Helper for Thread-Safe Broadcast
-def broadcast_sync(event_type: str, data: dict):
-    # data["type"] = event_type
-    message = json.dumps({"type": event_type, "data": data})
-    try:
-        loop = asyncio.get_running_loop()
-    except RuntimeError:
-        loop = None
-        
-    if loop and loop.is_running():
-         pass
-         
-# Better approach: store loop globally
-loop_instance = None
-@app.on_event("startup")
-async def set_loop():
-    global loop_instance
-    loop_instance = asyncio.get_running_loop()
+    if _drain_task:
+        _drain_task.cancel()
 
 def event_callback(event, payload):
-    # print(f"EVENT_CALLBACK: {event} - {payload} - loop_instance={loop_instance}")
-    if loop_instance:
-        message = json.dumps({"type": event, "payload": payload})
-        # print(f"Broadcasting: {message}")
-        asyncio.run_coroutine_threadsafe(manager.broadcast(message), loop_instance)
-    else:
-        print("WARNING: loop_instance is None, cannot broadcast events")
+    logger.debug("Event callback: %s - %s", event, payload)
+    if loop_instance is None:
+        logger.warning("loop_instance is None, cannot broadcast events")
+        return
+    # Serialize on the calling (workflow) thread, which also snapshots the
+    # payload; the loop thread only queues and sends the bytes
+    try:
+        message = _json.dumps({"type": event, "payload": payload})
+    except (TypeError, ValueError) as e:
+        logger.error("Dropping unserializable %s event: %s", event, e)
+        return
+    loop_instance.call_soon_threadsafe(manager.enqueue, message)
 
 # CORS
 app.add_middleware(
@@ -94,10 +93,23 @@ def get_nodes():
 def list_workspaces():
     return workspace_manager.list_workspaces()
 
+def _activate_workspace(name: str):
+    workspace_manager.set_current_workspace(name)
+    # Update scheduler to watch new directory
+    new_workflows_dir = workspace_manager.get_workflows_dir(name)
+    scheduler.workflows_dir = new_workflows_dir 
+    scheduler.refresh_jobs()
+
 @app.post("/api/workspaces")
-def create_workspace(name: str = Body(..., embed=True)):
+def create_workspace(name: str = Body(..., embed=True), activate: bool = False):
     workspace_manager.create_workspace(name)
-    return {"status": "created", "name": name}
+    if activate:
+        # Create-and-switch in one request
+        try:
+            _activate_workspace(name)
+        except ValueError as e:
+            raise HTTPException(status_code=404, detail=str(e))
+    return {"status": "created", "name": name, "active": workspace_manager.get_current_workspace()}
 
 @app.get("/api/workspaces/active")
 def get_active_workspace():
@@ -106,11 +118,7 @@ def get_active_workspace():
 @app.post("/api/workspaces/active")
 def set_active_workspace(name: str = Body(..., embed=True)):
     try:
-        workspace_manager.set_current_workspace(name)
-        # Update scheduler to watch new directory
-        new_workflows_dir = workspace_manager.get_workflows_dir(name)
-        scheduler.workflows_dir = new_workflows_dir 
-        scheduler.refresh_jobs()
+        _activate_workspace(name)
         return {"status": "switched", "name": name}
     except ValueError as e:
         raise HTTPException(status_code=404, detail=str(e))
@@ -130,7 +138,7 @@ async def run_workflow_endpoint(workflow: Workflow):
     from .engine import run_workflow
     try:
         # Broadcast Start
-        await manager.broadcast(json.dumps({"type": "workflow_start", "payload": {"name": "manual_run"}}))
+        event_callback("workflow_start", {"name": "manual_run"})
         
         # Inject Workspace Context
         # We can pass the workspace data path to the engine/nodes
@@ -145,11 +153,11 @@ async def run_workflow_endpoint(workflow: Workflow):
         result = await run_workflow(workflow, event_callback)
         
         # Broadcast End
-        await manager.broadcast(json.dumps({"type": "workflow_end", "payload": result}))
+        event_callback("workflow_end", result)
         
         return result
     except Exception as e:
-         await manager.broadcast(json.dumps({"type": "workflow_error", "payload": str(e)}))
+         event_callback("workflow_error", str(e))
          raise HTTPException(status_code=400, detail=str(e))
 
 @app.post("/api/export")
@@ -196,8 +204,8 @@ def load_workflow(name: str):
     if not os.path.exists(file_path):
         raise HTTPException(status_code=404, detail="Workflow not found")
         
-    with open(file_path, "r") as f:
-        data = json.load(f)
+    with open(file_path, "rb") as f:
+        data = _json.loads(f.read())
         
     return data
 
@@ -10,7 +10,6 @@ from .nodes.control_flow import IfElseNode, SwitchNode, LoopNode, WhileNode, Mer
 from .nodes.web import WebSearchNode, WebFetchNode, RSSNode
 from .nodes.data import MemoryNode, SQLiteNode, VariableExtractorNode
 from .nodes.vector_memory import VectorMemoryNode
-from .nodes.base import NodeSchema
 from .nodes.scheduling import CronNode
 from .nodes.human import HumanInputNode
 from .nodes.script import ScriptNode
@@ -0,0 +1,48 @@
+"""Shared HTTP client for nodes that talk to OpenAI-compatible servers."""
+
+import ssl
+import atexit
+import threading
+import httpx
+
+_client = None
+_lock = threading.Lock()
+
+_LIMITS = httpx.Limits(
+    max_connections=100,
+    max_keepalive_connections=50,
+    keepalive_expiry=60,
+)
+_TIMEOUT = httpx.Timeout(600.0)
+
+
+def get_httpx_client() -> httpx.Client:
+    """Return the process-wide httpx client, creating it on first use.
+
+    Every OpenAI client built by the nodes shares this connection pool, so
+    sequential and concurrent requests to the same server reuse sockets.
+    """
+    global _client
+    if _client is None:
+        with _lock:
+            if _client is None:
+                _client = httpx.Client(
+                    verify=ssl.create_default_context(),
+                    limits=_LIMITS,
+                    timeout=_TIMEOUT,
+                )
+                atexit.register(_client.close)
+    return _client
+
+
+def new_async_httpx_client() -> httpx.AsyncClient:
+    """Return a new async client with the same pool settings.
+
+    Async pools are bound to the event loop that opened them, so callers own
+    the client and must close it before their loop ends.
+    """
+    return httpx.AsyncClient(
+        verify=ssl.create_default_context(),
+        limits=_LIMITS,
+        timeout=_TIMEOUT,
+    )
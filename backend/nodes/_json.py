@@ -0,0 +1,42 @@
+"""JSON helpers shared by the backend (memory files, websocket frames,
+workflow files); use orjson when it is installed."""
+
+import json
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# orjson.JSONDecodeError subclasses json.JSONDecodeError, so one except works
+JSONDecodeError = json.JSONDecodeError
+
+
+def loads(data):
+    """Parse JSON from bytes or str."""
+    if orjson is not None:
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            pass  # e.g. NaN/Infinity written by json.dump; let the stdlib decide
+    return json.loads(data)
+
+
+def dumps(obj) -> bytes:
+    """Compact UTF-8 JSON, e.g. for JSON-Lines records."""
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+        except TypeError:
+            pass  # e.g. ints beyond 64 bits; let the stdlib handle it
+    return json.dumps(obj, ensure_ascii=False).encode("utf-8")
+
+
+def dumps_pretty(obj) -> bytes:
+    """Indented UTF-8 JSON, matching json.dump(indent=2, ensure_ascii=False)."""
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+        except TypeError:
+            pass
+    return json.dumps(obj, indent=2, ensure_ascii=False).encode("utf-8")
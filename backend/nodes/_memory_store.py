@@ -0,0 +1,345 @@
+"""
+Process-wide persistent memory shared by MemoryNode and LLMNode.
+
+The parsed MEMORY_FILE is kept in memory as the source of truth. Writes mark
+it dirty and wake a background thread that coalesces bursts into a single
+atomic rewrite (temp file + os.replace) after FLUSH_DELAY seconds.
+
+Lists grown through MemoryNode "append" live in JSON-Lines sidecar files next
+to MEMORY_FILE, so an append writes one line instead of re-serializing the
+whole memory file. LLM chat histories live in one file per conversation under
+HISTORY_DIR, so saving a turn rewrites only that conversation.
+"""
+
+import os
+import abc
+import copy
+import atexit
+import threading
+import time
+from urllib.parse import quote, unquote
+import config
+from . import _json
+
+# Seconds to wait after a change so bursts of writes share one flush
+FLUSH_DELAY = 0.25
+
+SIDECAR_SUFFIX = ".jsonl"
+
+# Legacy MEMORY_FILE key prefix for chat histories (now in HISTORY_DIR)
+LEGACY_HISTORY_PREFIX = "_chat_history_"
+
+_UNLOADED = object()
+
+
+def _atomic_write(path, payload: bytes):
+    tmp_path = path.with_name(path.name + ".tmp")
+    with open(tmp_path, "wb") as f:
+        f.write(payload)
+    os.replace(tmp_path, path)
+
+
+class _DebouncedStore(abc.ABC):
+    """Base for stores whose changes are written by a background flush."""
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._wake = threading.Event()
+        self._thread = None
+
+    @abc.abstractmethod
+    def flush(self):
+        """Write pending changes to disk."""
+
+    def _schedule_flush(self):
+        if self._thread is None:
+            self._thread = threading.Thread(
+                target=self._flush_loop, name=f"{type(self).__name__}-flush", daemon=True
+            )
+            self._thread.start()
+        self._wake.set()
+
+    def _flush_loop(self):
+        while True:
+            self._wake.wait()
+            self._wake.clear()
+            time.sleep(FLUSH_DELAY)
+            self.flush()
+
+
+class MemoryStore(_DebouncedStore):
+    def __init__(self):
+        super().__init__()
+        self._path = None
+        self._stamp = _UNLOADED  # (mtime_ns, size) of the file we last read/wrote
+        self._data = {}  # keys stored in MEMORY_FILE
+        self._lists = {}  # keys stored in sidecars
+        self._writers = {}  # open append handles, keyed by key
+        self._dirty = False
+
+    # --- Reads ---------------------------------------------------------
+
+    def read(self) -> dict:
+        """
+        Return a snapshot of all persistent keys (sidecar lists included).
+
+        The dict is a copy; the values are shared and must not be mutated.
+        """
+        with self._lock:
+            self._ensure_loaded()
+            data = dict(self._data)
+            data.update(self._lists)
+            return data
+
+    def get(self, key: str, default=None):
+        with self._lock:
+            self._ensure_loaded()
+            if key in self._lists:
+                return self._lists[key]
+            return self._data.get(key, default)
+
+    # --- Writes --------------------------------------------------------
+
+    def set(self, key: str, value):
+        """Store a copy of value, so later in-place changes the caller makes
+        (e.g. to the same object in session memory) are never persisted."""
+        value = copy.deepcopy(value)
+        with self._lock:
+            self._ensure_loaded()
+            self._drop_sidecar(key)
+            self._data[key] = value
+            self._mark_dirty()
+
+    def delete(self, key: str) -> bool:
+        """Remove a key; returns False if it did not exist."""
+        with self._lock:
+            self._ensure_loaded()
+            found = key in self._data or key in self._lists
+            if found:
+                self._drop_sidecar(key)
+                self._data.pop(key, None)
+                self._mark_dirty()
+            return found
+
+    def append(self, key: str, value) -> list:
+        """
+        Append to a list value through its sidecar and return the list.
+
+        The list is the store's own (copying it would make N appends O(N^2));
+        it must not be mutated, see holds().
+        """
+        with self._lock:
+            self._ensure_loaded()
+            items = self._lists.get(key)
+            if items is None:
+                # First append: move the existing value into a sidecar; only
+                # then does MEMORY_FILE itself need rewriting
+                existing = []
+                if key in self._data:
+                    existing = self._data.pop(key)
+                    self._dirty = True
+                if not isinstance(existing, list):
+                    existing = [existing] if existing else []
+                items = self._lists[key] = list(existing)
+                self._write_sidecar(key, items)
+
+            items.append(value)
+            self._write_sidecar(key, [value])
+            # The flush pushes the sidecar line out; MEMORY_FILE is only
+            # rewritten when dirty
+            self._schedule_flush()
+            return items
+
+    def holds(self, key: str, value) -> bool:
+        """True if value is the store's own object for key (e.g. the list
+        append() returned), which callers must copy before changing."""
+        with self._lock:
+            return self._lists.get(key) is value or self._data.get(key) is value
+
+    # --- Persistence ---------------------------------------------------
+
+    def flush(self):
+        """Write pending changes to disk now."""
+        with self._lock:
+            for writer in self._writers.values():
+                writer.flush()
+            if not self._dirty or self._path is None:
+                return
+            try:
+                _atomic_write(self._path, _json.dumps_pretty(self._data))
+                self._dirty = False
+                self._stamp = self._file_stamp(self._path)
+            except OSError as e:
+                print(f"Error saving persistent memory: {e}")
+
+    def close(self):
+        with self._lock:
+            self.flush()
+            for writer in self._writers.values():
+                writer.close()
+            self._writers.clear()
+
+    def _mark_dirty(self):
+        self._dirty = True
+        self._schedule_flush()
+
+    def _ensure_loaded(self):
+        """(Re)load from disk on first use, when MEMORY_FILE moves, or when it
+        changed on disk while we had nothing pending."""
+        path = config.MEMORY_FILE
+        if path != self._path:
+            if self._path is not None:
+                self.close()
+            self._path = path
+            self._stamp = _UNLOADED
+        elif self._dirty:
+            return
+
+        stamp = self._file_stamp(path)
+        if stamp == self._stamp:
+            return
+
+        data = {}
+        if stamp is not None:
+            try:
+                with open(path, "rb") as f:
+                    data = _json.loads(f.read())
+            except (_json.JSONDecodeError, IOError):
+                data = {}
+        self._data = data
+        self._stamp = stamp
+        self._load_sidecars()
+
+    def _load_sidecars(self):
+        for writer in self._writers.values():
+            writer.flush()
+        self._lists = {}
+        folder = self._path.parent
+        if not folder.exists():
+            return
+        prefix = self._path.name + "."
+        for entry in os.scandir(folder):
+            name = entry.name
+            if not (name.startswith(prefix) and name.endswith(SIDECAR_SUFFIX)):
+                continue
+            key = unquote(name[len(prefix):-len(SIDECAR_SUFFIX)])
+            try:
+                items = []
+                with open(entry.path, "rb") as f:
+                    for line in f:
+                        if line.strip():
+                            items.append(_json.loads(line))
+                self._lists[key] = items
+            except (_json.JSONDecodeError, IOError) as e:
+                print(f"Error loading persistent list '{key}': {e}")
+
+    def _sidecar_path(self, key: str):
+        return self._path.with_name(
+            f"{self._path.name}.{quote(key, safe='')}{SIDECAR_SUFFIX}"
+        )
+
+    def _write_sidecar(self, key: str, values: list):
+        writer = self._writers.get(key)
+        if writer is None:
+            writer = self._writers[key] = open(self._sidecar_path(key), "ab")
+        writer.write(b"".join(_json.dumps(v) + b"\n" for v in values))
+
+    def _drop_sidecar(self, key: str):
+        if self._lists.pop(key, None) is None:
+            return
+        writer = self._writers.pop(key, None)
+        if writer is not None:
+            writer.close()
+        path = self._sidecar_path(key)
+        if path.exists():
+            path.unlink()
+
+    @staticmethod
+    def _file_stamp(path):
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        return (st.st_mtime_ns, st.st_size)
+
+
+class HistoryStore(_DebouncedStore):
+    """Chat histories keyed by conversation id, one JSON file each."""
+
+    def __init__(self, memory: MemoryStore):
+        super().__init__()
+        self._memory = memory
+        self._dir = None
+        self._histories = {}
+        self._dirty = set()
+
+    def get(self, conversation_id: str) -> list:
+        """Return the conversation's messages; the list must not be mutated."""
+        with self._lock:
+            self._ensure_dir()
+            history = self._histories.get(conversation_id)
+            if history is None:
+                history = []
+                path = self._path(conversation_id)
+                if path.exists():
+                    try:
+                        with open(path, "rb") as f:
+                            history = _json.loads(f.read())
+                    except (_json.JSONDecodeError, IOError) as e:
+                        print(f"Error loading chat history '{conversation_id}': {e}")
+                self._histories[conversation_id] = history
+            return history
+
+    def set(self, conversation_id: str, history: list):
+        with self._lock:
+            self._ensure_dir()
+            self._histories[conversation_id] = history
+            self._dirty.add(conversation_id)
+            self._schedule_flush()
+
+    def flush(self):
+        with self._lock:
+            if not self._dirty:
+                return
+            self._dir.mkdir(parents=True, exist_ok=True)
+            for conversation_id in list(self._dirty):
+                try:
+                    _atomic_write(
+                        self._path(conversation_id),
+                        _json.dumps_pretty(self._histories[conversation_id]),
+                    )
+                    self._dirty.discard(conversation_id)
+                except OSError as e:
+                    print(f"Error saving chat history '{conversation_id}': {e}")
+
+    def _path(self, conversation_id: str):
+        return self._dir / f"{quote(conversation_id, safe='')}.json"
+
+    def _ensure_dir(self):
+        directory = config.HISTORY_DIR
+        if directory == self._dir:
+            return
+        if self._dir is not None:
+            self.flush()
+        self._dir = directory
+        self._histories = {}
+        self._migrate_legacy()
+
+    def _migrate_legacy(self):
+        """Move "_chat_history_<id>" keys out of MEMORY_FILE into history files."""
+        legacy = [k for k in self._memory.read() if k.startswith(LEGACY_HISTORY_PREFIX)]
+        for key in legacy:
+            conversation_id = key[len(LEGACY_HISTORY_PREFIX):]
+            history = self._memory.get(key)
+            self._memory.delete(key)
+            if isinstance(history, list) and not self._path(conversation_id).exists():
+                self._histories[conversation_id] = history
+                self._dirty.add(conversation_id)
+        if self._dirty:
+            self.flush()
+
+
+memory_store = MemoryStore()
+history_store = HistoryStore(memory_store)
+atexit.register(memory_store.close)
+atexit.register(history_store.flush)
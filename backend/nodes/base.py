@@ -1,6 +1,9 @@
 from pocketflow import Node, BatchNode, AsyncNode
 from pydantic import BaseModel
 from typing import List, Dict, Any, Type, Optional, Union
+import logging
+
+logger = logging.getLogger(__name__)
 
 
 class ParameterDefinition(BaseModel):
@@ -53,8 +56,8 @@ class BasePlatformNode:
         node_id = getattr(self, "id", "unknown")
         callback = getattr(self, "on_event", None)
 
-        print(
-            f"DEBUG BasePlatformNode.run: node_id={node_id}, has_callback={callback is not None}"
+        logger.debug(
+            "BasePlatformNode.run: node_id=%s, has_callback=%s", node_id, callback is not None
         )
 
         if callback:
@@ -69,7 +72,7 @@ class BasePlatformNode:
             # We usually need an event loop.
             # Valid approach: pass a synchronous wrapper that schedules the task on the loop.
             try:
-                print(f"DEBUG: Calling callback for node_start: {node_id}")
+                logger.debug("Calling callback for node_start: %s", node_id)
                 callback("node_start", {"node_id": node_id})
             except Exception as e:
                 print(f"Callback error: {e}")
@@ -81,7 +84,7 @@ class BasePlatformNode:
 
             if callback:
                 try:
-                    print(f"DEBUG: Calling callback for node_end: {node_id}")
+                    logger.debug("Calling callback for node_end: %s", node_id)
                     callback("node_end", {"node_id": node_id, "node_name": getattr(self, "name", node_id)})
                     
                     # Broadcast state_update after each node completes
@@ -97,11 +100,11 @@ class BasePlatformNode:
                             return str(obj)
                     
                     raw_results = shared.get("results", {})
-                    print(f"DEBUG: Broadcasting state_update. Raw results keys: {list(raw_results.keys())}")
+                    logger.debug("Broadcasting state_update. Raw results keys: %s", raw_results.keys())
                     serialized_results = safe_serialize(raw_results)
                     serialized_memory = safe_serialize(shared.get("memory", {}))
                     
-                    print(f"DEBUG: Serialized results: {serialized_results}")
+                    logger.debug("Serialized results: %s", serialized_results)
                     
                     callback("state_update", {
                         "memory": serialized_memory,
@@ -123,8 +126,7 @@ class BasePlatformNode:
             raise e
 
     def post(self, shared, prep_res, exec_res):
-        print(f"DEBUG: Executing post for {getattr(self, 'name', 'Unknown')}")
-        print(f"DEBUG BasePlatformNode.post: exec_res type={type(exec_res)}")
+        logger.debug("Executing post for %s, exec_res type=%s", getattr(self, "name", "Unknown"), type(exec_res))
         if "results" not in shared:
             shared["results"] = {}
         
@@ -145,7 +147,7 @@ class BasePlatformNode:
                 del shared["results"][node_id]
             shared["results"][node_id] = exec_res
 
-        print(f"DEBUG: Updated shared['results'] with {self.name} (moved to end)")
+        logger.debug("Updated shared['results'] with %s (moved to end)", self.name)
         
         # Broadcast node_end and state_update
         # Run() is bypassed by PocketFlow engine, so we must do it here
@@ -170,7 +172,7 @@ class BasePlatformNode:
                 serialized_results = safe_serialize(shared.get("results", {}))
                 serialized_memory = safe_serialize(shared.get("memory", {}))
                 
-                print(f"DEBUG: Broadcasting state_update from post(). Results keys: {list(serialized_results.keys())}")
+                logger.debug("Broadcasting state_update from post(). Results keys: %s", serialized_results.keys())
                 callback("state_update", {
                     "memory": serialized_memory,
                     "results": serialized_results,
@@ -211,7 +213,7 @@ class DebugNode(BasePlatformNode, Node):
         results = shared.get("results", {})
         last_result = None
         if results:
-            last_key = list(results.keys())[-1]
+            last_key = next(reversed(results))
             last_result = results[last_key]
 
         return {
@@ -14,10 +14,22 @@ Provides conditional branching and looping constructs:
 import json
 import time
 import os
+from functools import lru_cache
 from .base import BasePlatformNode
 from pocketflow import Node
 
 
+@lru_cache(maxsize=32)
+def _load_workflow(file_path: str, mtime_ns: int, size: int):
+    """Parse and validate a saved workflow; the stat fields key out stale entries."""
+    # Imported here to avoid circular imports
+    from ..schemas import Workflow
+
+    with open(file_path, "rb") as f:
+        # Pydantic parses and validates the raw JSON in one pass
+        return Workflow.model_validate_json(f.read())
+
+
 class IfElseNode(BasePlatformNode, Node):
     """Evaluates condition and routes to 'true' or 'false' output."""
 
@@ -41,7 +53,7 @@ class IfElseNode(BasePlatformNode, Node):
         # Get from shared results
         results = shared.get("results", {})
         if results:
-            last_key = list(results.keys())[-1]
+            last_key = next(reversed(results))
             return {"input": results[last_key]}
         return {"input": ""}
 
@@ -91,7 +103,7 @@ class SwitchNode(BasePlatformNode, Node):
     def prep(self, shared):
         results = shared.get("results", {})
         if results:
-            last_key = list(results.keys())[-1]
+            last_key = next(reversed(results))
             return {"input": str(results[last_key])}
         return {"input": ""}
 
@@ -235,7 +247,7 @@ class WhileNode(BasePlatformNode, Node):
         # Add last result
         results = shared.get("results", {})
         if results:
-            last_key = list(results.keys())[-1]
+            last_key = next(reversed(results))
             context["input"] = results[last_key]
 
         return {"context": context, "while_key": while_key, "shared": shared}
@@ -288,7 +300,7 @@ class MergeNode(BasePlatformNode, Node):
         # Simply pass through the last result
         results = shared.get("results", {})
         if results:
-            last_key = list(results.keys())[-1]
+            last_key = next(reversed(results))
             return results[last_key]
         return None
 
@@ -316,7 +328,7 @@ class TryCatchNode(BasePlatformNode, Node):
         # Get the last result which may contain an error
         results = shared.get("results", {})
         if results:
-            last_key = list(results.keys())[-1]
+            last_key = next(reversed(results))
             return {"input": results[last_key], "key": last_key}
         return {"input": None, "key": None}
 
@@ -369,7 +381,7 @@ class DelayNode(BasePlatformNode, Node):
         # Pass through the last result
         results = shared.get("results", {})
         if results:
-            last_key = list(results.keys())[-1]
+            last_key = next(reversed(results))
             return results[last_key]
         return None
 
@@ -419,7 +431,7 @@ class JSONDispatcherNode(BasePlatformNode, Node):
         results = shared.get("results", {})
         input_val = None
         if results:
-            last_key = list(results.keys())[-1]
+            last_key = next(reversed(results))
             input_val = results[last_key]
 
         return {"input": input_val}
@@ -511,14 +523,12 @@ class SubWorkflowNode(BasePlatformNode, Node):
             return f"Error: Workflow '{workflow_name}' not found at {file_path}"
 
         try:
-            with open(file_path, "r") as f:
-                wf_data = json.load(f)
+            # Loops re-running the same sub-workflow reuse the validated model
+            st = os.stat(file_path)
+            workflow_obj = _load_workflow(file_path, st.st_mtime_ns, st.st_size)
 
             # Import engine components here to avoid circular imports
-            from ..engine import build_graph
-            from ..schemas import Workflow
-
-            workflow_obj = Workflow(**wf_data)
+            from ..engine import build_graph, run_flow
             # Use same on_event for the subflow so events show up in UI
             on_event = getattr(self, "on_event", None)
             flow, error = build_graph(workflow_obj, event_callback=on_event)
@@ -532,7 +542,7 @@ class SubWorkflowNode(BasePlatformNode, Node):
                 sub_shared["memory"] = shared.get("memory", {}).copy()
 
             # Run the sub-workflow (synchronously within the thread)
-            flow.run(sub_shared)
+            run_flow(flow, sub_shared)
 
             # Extract results and merge memory back if needed
             sub_results = sub_shared.get("results", {})
@@ -584,7 +594,7 @@ class SequentialBatchNode(BasePlatformNode, Node):
             if items is None:
                 results = shared.get("results", {})
                 if results:
-                    last_key = list(results.keys())[-1]
+                    last_key = next(reversed(results))
                     input_val = results[last_key]
                     if isinstance(input_val, list):
                         items = input_val
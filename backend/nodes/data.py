@@ -1,9 +1,11 @@
 import sqlite3
-import os
 import json
 from .base import BasePlatformNode
 from pocketflow import Node
-from config import MEMORY_FILE
+from ._memory_store import memory_store
+
+# Sentinel for dict.pop() so stored None values still count as present
+_MISSING = object()
 
 
 class MemoryNode(BasePlatformNode, Node):
@@ -67,7 +69,7 @@ class MemoryNode(BasePlatformNode, Node):
         input_value = None
         results = shared.get("results", {})
         if results:
-            last_key = list(results.keys())[-1]
+            last_key = next(reversed(results))
             input_value = results[last_key]
 
         return {
@@ -93,8 +95,11 @@ class MemoryNode(BasePlatformNode, Node):
         shared = prep_res["shared"]
         namespace = prep_res["namespace"]
 
+        # prep() guarantees shared["memory"] exists
+        mem = shared["memory"]
+
         # Choose storage: persistent or session
-        storage = persistent_data if persistent else shared.get("memory", {})
+        storage = persistent_data if persistent else mem
 
         if op == "get":
             result = storage.get(full_key, None)
@@ -124,11 +129,11 @@ class MemoryNode(BasePlatformNode, Node):
             storage[full_key] = store_value
 
             # Update shared memory (for session access by other nodes)
-            shared["memory"][full_key] = store_value
+            mem[full_key] = store_value
 
             # Persist if needed
             if persistent:
-                self._save_persistent(storage)
+                memory_store.set(full_key, store_value)
 
             return {
                 "success": True,
@@ -137,12 +142,10 @@ class MemoryNode(BasePlatformNode, Node):
             }
 
         elif op == "delete":
-            if full_key in storage:
-                del storage[full_key]
-                if full_key in shared.get("memory", {}):
-                    del shared["memory"][full_key]
+            if storage.pop(full_key, _MISSING) is not _MISSING:
+                mem.pop(full_key, None)
                 if persistent:
-                    self._save_persistent(storage)
+                    memory_store.delete(full_key)
                 return {
                     "success": True,
                     "value": None,
@@ -170,16 +173,20 @@ class MemoryNode(BasePlatformNode, Node):
             # Append to a list value
             store_value = value if value else input_value
 
-            existing = storage.get(full_key, [])
-            if not isinstance(existing, list):
-                existing = [existing] if existing else []
-
-            existing.append(store_value)
-            storage[full_key] = existing
-            shared["memory"][full_key] = existing
-
             if persistent:
-                self._save_persistent(storage)
+                # The store appends one line to the key's sidecar file and
+                # hands back its own (read-only) list
+                existing = memory_store.append(full_key, store_value)
+                storage[full_key] = existing
+            else:
+                existing = storage.get(full_key, [])
+                if not isinstance(existing, list):
+                    existing = [existing] if existing else []
+                elif memory_store.holds(full_key, existing):
+                    # Session-only changes must not reach the persisted list
+                    existing = list(existing)
+                existing.append(store_value)
+            mem[full_key] = existing
 
             return {
                 "success": True,
@@ -190,22 +197,8 @@ class MemoryNode(BasePlatformNode, Node):
         return {"success": False, "value": None, "message": f"Unknown operation: {op}"}
 
     def _load_persistent(self) -> dict:
-        """Load persistent memory from JSON file."""
-        if os.path.exists(MEMORY_FILE):
-            try:
-                with open(MEMORY_FILE, "r", encoding="utf-8") as f:
-                    return json.load(f)
-            except (json.JSONDecodeError, IOError):
-                return {}
-        return {}
-
-    def _save_persistent(self, data: dict):
-        """Save persistent memory to JSON file."""
-        try:
-            with open(MEMORY_FILE, "w", encoding="utf-8") as f:
-                json.dump(data, f, indent=2, ensure_ascii=False)
-        except IOError as e:
-            print(f"Error saving persistent memory: {e}")
+        """Snapshot of persistent memory (shared with LLMNode)."""
+        return memory_store.read()
 
     def post(self, shared, prep_res, exec_res):
         """Return the value for downstream nodes."""
@@ -246,23 +239,36 @@ class SQLiteNode(BasePlatformNode, Node):
         # Get input from previous node
         results = shared.get("results", {})
         if results:
-            last_key = list(results.keys())[-1]
+            last_key = next(reversed(results))
             context["input"] = results[last_key]
 
         # Add memory variables
         if "memory" in shared:
             context.update(shared["memory"])
 
+        query = cfg.get("query", "")
+
         return {
             "db_path": cfg.get("db_path", "database.db"),
-            "query": cfg.get("query", ""),
+            "query": query,
+            # Templated queries are classified after substitution in exec
+            "is_select": None if "{" in query else self._is_select(query),
             "as_list": cfg.get("as_list", False),
             "context": context,
         }
 
+    def _is_select(self, query: str) -> bool:
+        """Classify the (static) query once and reuse it across loop iterations."""
+        cached = getattr(self, "_select_cache", None)
+        if cached is None or cached[0] is not query:
+            cached = (query, query.lstrip()[:6].lower() == "select")
+            self._select_cache = cached
+        return cached[1]
+
     def exec(self, prep_res):
         db_path = prep_res["db_path"]
         query = prep_res["query"]
+        is_select = prep_res["is_select"]
         as_list = prep_res["as_list"]
         context = prep_res["context"]
 
@@ -278,12 +284,15 @@ class SQLiteNode(BasePlatformNode, Node):
                 safe_value = str(value)
             query = query.replace(f"{{{key}}}", safe_value)
 
+        if is_select is None:
+            is_select = query.lstrip()[:6].lower() == "select"
+
         try:
             conn = sqlite3.connect(db_path)
             cursor = conn.cursor()
             cursor.execute(query)
 
-            if query.strip().lower().startswith("select"):
+            if is_select:
                 rows = cursor.fetchall()
                 columns = (
                     [desc[0] for desc in cursor.description]
@@ -346,7 +355,7 @@ class VariableExtractorNode(BasePlatformNode, Node):
         results = shared.get("results", {})
         input_data = None
         if results:
-            last_key = list(results.keys())[-1]
+            last_key = next(reversed(results))
             input_data = results[last_key]
 
         return {"input_data": input_data, "shared": shared}
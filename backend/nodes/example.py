@@ -47,7 +47,7 @@ class ExampleNode(BasePlatformNode, Node):
         # Extract input from previous node results
         results = shared.get("results", {})
         if results:
-            last_key = list(results.keys())[-1]
+            last_key = next(reversed(results))
             input_value = results[last_key]
         else:
             input_value = ""
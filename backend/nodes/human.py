@@ -1,13 +1,117 @@
+import copy
 import uuid
 import threading
 import json
 import time
+import queue
+import atexit
+import logging
+import logging.handlers
+from collections import deque
 from .base import BasePlatformNode
 from pocketflow import Node
 
+
+class _ParentForwarder(logging.Handler):
+    """Hands queued records to the handlers they would have propagated to
+    (backend.nodes, backend, root, ...), as configured at emit time."""
+
+    def emit(self, record):
+        logger.parent.callHandlers(record)
+
+
+class _LazyQueueHandler(logging.handlers.QueueHandler):
+    """Queues records, starting the listener thread on the first one."""
+
+    def emit(self, record):
+        _start_log_listener()
+        super().emit(record)
+
+
+def _start_log_listener():
+    global _log_listener
+    if _log_listener is not None:
+        return
+    with _log_listener_lock:
+        if _log_listener is None:
+            listener = logging.handlers.QueueListener(_log_queue, _ParentForwarder())
+            listener.start()
+            atexit.register(listener.stop)
+            _log_listener = listener
+
+
+# HITL nodes block worker threads; their log I/O goes through a queue drained
+# by a background listener so it never contends on stdout from those threads.
+# The listener replays each record through the parent loggers' handlers, so
+# output matches normal propagation.
+logger = logging.getLogger(__name__)
+logger.propagate = False
+_log_queue = queue.SimpleQueue()
+_log_listener = None
+_log_listener_lock = threading.Lock()
+logger.addHandler(_LazyQueueHandler(_log_queue))
+
+# Guards pending_requests; notified whenever a request is added or answered,
+# so any number of waiting nodes share one lock instead of an Event each
+_cv = threading.Condition()
+
+
+class _PendingRequests(dict):
+    """request_id -> entry dict, plus ways to block on new requests and answers."""
+
+    def __init__(self):
+        super().__init__()
+        self._new = deque()  # ids not yet handed out by wait_new()
+
+    def put(self, request_id, entry):
+        with _cv:
+            self[request_id] = entry
+            self._new.append(request_id)
+            _cv.notify_all()
+
+    def wait_new(self, timeout=None):
+        """Return the oldest request id not yet returned by wait_new, waiting
+        up to timeout seconds for one to be added; None on timeout."""
+        with _cv:
+            if not _cv.wait_for(lambda: self._new, timeout):
+                return None
+            return self._new.popleft()
+
+    def respond(self, request_id, response):
+        """Answer a pending request and wake its node. Returns False if the
+        request is unknown (already answered or timed out)."""
+        with _cv:
+            entry = self.get(request_id)
+            if entry is None or "response" in entry:
+                return False
+            entry["response"] = response
+            _cv.notify_all()
+            return True
+
+    def wait_response(self, request_id, timeout=None):
+        """Block until request_id is answered and remove it. Returns
+        (answered, response); (False, None) on timeout."""
+        with _cv:
+            entry = self[request_id]
+            answered = _cv.wait_for(lambda: "response" in entry, timeout)
+            del self[request_id]
+            return answered, entry.get("response")
+
+    def __delitem__(self, request_id):
+        with _cv:
+            super().__delitem__(request_id)
+            try:
+                self._new.remove(request_id)
+            except ValueError:
+                pass
+
+
 # Global storage for HITL requests to allow communication between main thread/API and worker threads
-# Key: request_id, Value: {"event": threading.Event, "response": Any}
-pending_requests = {}
+# Key: request_id, Value: {"node_id": str, "response": Any (set once answered)}
+pending_requests = _PendingRequests()
+
+# Fallback form when "fields" is not valid JSON: a single approval checkbox
+DEFAULT_FIELDS = [{"name": "approved", "type": "boolean", "label": "Approve?"}]
 
 class HumanInputNode(BasePlatformNode, Node):
     """
@@ -30,35 +134,41 @@ class HumanInputNode(BasePlatformNode, Node):
         input_val = None
         results = shared.get("results", {})
         if results:
-            last_key = list(results.keys())[-1]
+            last_key = next(reversed(results))
             input_val = results[last_key]
         
-        # Parse fields
-        fields_str = cfg.get("fields", "[]")
-        try:
-            fields = json.loads(fields_str)
-        except:
-            # Fallback default approval checkbox
-            fields = [{"name": "approved", "type": "boolean", "label": "Approve?"}]
-
         return {
             "prompt": cfg.get("prompt", "User Input Required"),
-            "fields": fields,
+            "fields": self._parse_fields(cfg.get("fields", "[]")),
             "timeout": int(cfg.get("timeout", 0) or 0),
             "input_val": input_val,
             "shared": shared
         }
 
+    def _parse_fields(self, fields_str):
+        """Parse the fields JSON, reusing the previous parse while config is
+        unchanged. Each call gets its own copy, so callers may mutate it."""
+        if fields_str == "[]":
+            return []
+
+        cached = getattr(self, "_fields_cache", None)
+        if cached is None or cached[0] != fields_str:
+            try:
+                fields = json.loads(fields_str)
+            except (ValueError, TypeError):
+                # Fallback default approval checkbox
+                fields = DEFAULT_FIELDS
+            cached = self._fields_cache = (fields_str, fields)
+
+        return copy.deepcopy(cached[1])
+
     def exec(self, prep_res):
         request_id = str(uuid.uuid4())
-        wait_event = threading.Event()
         
-        # Store in global registry
-        pending_requests[request_id] = {
-            "event": wait_event,
-            "response": None,
+        # Store in global registry; "response" is added when the user answers
+        pending_requests.put(request_id, {
             "node_id": getattr(self, 'id', 'unknown')
-        }
+        })
         
         # Broadcast via WebSocket if callback available
         on_event = getattr(self, 'on_event', None)
@@ -70,22 +180,19 @@ class HumanInputNode(BasePlatformNode, Node):
                 "data": prep_res["input_val"] # Context to show the user
             })
         
-        print(f"HumanInputNode [{self.name}]: Waiting for user response (ID: {request_id})")
+        logger.info("HumanInputNode [%s]: Waiting for user response (ID: %s)", self.name, request_id)
         
         # Wait for signal from API
         timeout = prep_res["timeout"]
-        signaled = wait_event.wait(timeout=timeout if timeout > 0 else None)
+        signaled, response_data = pending_requests.wait_response(
+            request_id, timeout=timeout if timeout > 0 else None
+        )
         
         if not signaled:
-            print(f"HumanInputNode [{self.name}]: Timeout reached.")
-            del pending_requests[request_id]
+            logger.info("HumanInputNode [%s]: Timeout reached.", self.name)
             return {"error": "Timeout", "data": None, "approved": False}
         
-        # Retrieve response
-        response_data = pending_requests[request_id]["response"]
-        del pending_requests[request_id]
-        
-        print(f"HumanInputNode [{self.name}]: Received response: {response_data}")
+        logger.info("HumanInputNode [%s]: Received response: %s", self.name, response_data)
         
         return {
             "data": response_data,
@@ -1,8 +1,86 @@
 import os
+import atexit
+import threading
+from collections import OrderedDict
+from functools import lru_cache
 from .base import BasePlatformNode
 from pocketflow import Node
 from config import ROOT_DIR
 
+# Open PyMuPDF documents reused across PDFReadNode calls, keyed by
+# (abspath, mtime_ns) so an edited file is reopened. LRU-bounded.
+PDF_POOL_SIZE = 8
+_pdf_doc_pool = OrderedDict()
+_pdf_pool_lock = threading.RLock()
+
+
+def _acquire_pdf(file_path: str):
+    """Return an open fitz.Document for file_path, from the pool if possible.
+
+    Callers must hold _pdf_pool_lock while using the document.
+    """
+    import fitz  # PyMuPDF
+
+    abspath = os.path.abspath(file_path)
+    key = (abspath, os.stat(abspath).st_mtime_ns)
+    doc = _pdf_doc_pool.get(key)
+    if doc is not None:
+        _pdf_doc_pool.move_to_end(key)
+        return doc
+
+    doc = fitz.open(abspath)
+    _pdf_doc_pool[key] = doc
+    while len(_pdf_doc_pool) > PDF_POOL_SIZE:
+        _, evicted = _pdf_doc_pool.popitem(last=False)
+        evicted.close()
+    return doc
+
+
+def _close_pdf_pool():
+    with _pdf_pool_lock:
+        for doc in _pdf_doc_pool.values():
+            doc.close()
+        _pdf_doc_pool.clear()
+
+
+atexit.register(_close_pdf_pool)
+
+
+@lru_cache(maxsize=256)
+def _parse_page_range_cached(page_range: str, total_pages: int) -> tuple:
+    """Memoized page range parser shared by all PDFReadNode instances."""
+    pages = []
+    in_order = True
+    parts = page_range.replace(" ", "").split(",")
+
+    for part in parts:
+        if "-" in part:
+            try:
+                start, end = part.split("-")
+                start = max(1, int(start))
+                end = min(total_pages, int(end))
+            except ValueError:
+                continue
+            new_pages = range(start - 1, end)
+        else:
+            try:
+                page = int(part)
+            except ValueError:
+                continue
+            if not 1 <= page <= total_pages:
+                continue
+            new_pages = (page - 1,)
+
+        if new_pages:
+            if pages and new_pages[0] <= pages[-1]:
+                in_order = False
+            pages.extend(new_pages)
+
+    if not pages:
+        return tuple(range(total_pages))
+    # Ranges are usually given in ascending order; only dedupe/sort when not
+    return tuple(pages) if in_order else tuple(sorted(set(pages)))
+
 
 class FileReadNode(BasePlatformNode, Node):
     NODE_TYPE = "file_read"
@@ -52,7 +130,7 @@ class FileWriteNode(BasePlatformNode, Node):
         results = shared.get("results", {})
         if results:
             # Get the last result added to shared
-            last_key = list(results.keys())[-1]
+            last_key = next(reversed(results))
             input_data = results[last_key]
 
         # Add variable substitution from memory and results
@@ -191,22 +269,19 @@ class PDFReadNode(BasePlatformNode, Node):
     def _read_file(self, file_path: str, page_range: str) -> dict:
         """Read single PDF, return list of page texts."""
         try:
-            import fitz  # PyMuPDF
+            with _pdf_pool_lock:
+                doc = _acquire_pdf(file_path)
+                total_pages = len(doc)
 
-            doc = fitz.open(file_path)
-            total_pages = len(doc)
+                # Parse page range
+                pages_to_read = self._parse_page_range(page_range, total_pages)
 
-            # Parse page range
-            pages_to_read = self._parse_page_range(page_range, total_pages)
-
-            # Extract text from each page
-            page_texts = []
-            for page_num in pages_to_read:
-                page = doc[page_num]
-                text = page.get_text()
-                page_texts.append(text)
-
-            doc.close()
+                # Extract text from each page
+                page_texts = []
+                for page_num in pages_to_read:
+                    page = doc[page_num]
+                    text = page.get_text()
+                    page_texts.append(text)
 
             return {
                 "items": page_texts,
@@ -219,32 +294,11 @@ class PDFReadNode(BasePlatformNode, Node):
         except Exception as e:
             return {"error": f"Error reading PDF: {e}", "items": [], "mode": "error"}
 
-    def _parse_page_range(self, page_range: str, total_pages: int) -> list:
-        """Parse page range string like '1-5' or '1,3,5' into list of 0-indexed page numbers."""
+    def _parse_page_range(self, page_range: str, total_pages: int):
+        """Parse page range string like '1-5' or '1,3,5' into 0-indexed page numbers."""
         if not page_range.strip():
-            return list(range(total_pages))
-
-        pages = set()
-        parts = page_range.replace(" ", "").split(",")
-
-        for part in parts:
-            if "-" in part:
-                try:
-                    start, end = part.split("-")
-                    start = max(1, int(start))
-                    end = min(total_pages, int(end))
-                    pages.update(range(start - 1, end))
-                except ValueError:
-                    pass
-            else:
-                try:
-                    page = int(part)
-                    if 1 <= page <= total_pages:
-                        pages.add(page - 1)
-                except ValueError:
-                    pass
-
-        return sorted(pages) if pages else list(range(total_pages))
+            return range(total_pages)
+        return _parse_page_range_cached(page_range, total_pages)
 
     def post(self, shared, prep_res, exec_res):
         """Store result for Loop node compatibility."""
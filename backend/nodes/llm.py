@@ -1,9 +1,124 @@
 from .base import BasePlatformNode
 from pocketflow import Node
 import openai
+import asyncio
 import os
+import re
 import json
+import logging
+import threading
+import time
 import config
+from collections import ChainMap, deque
+from functools import lru_cache
+from ._http import get_httpx_client, new_async_httpx_client
+from . import _json
+from ._memory_store import memory_store, history_store
+
+try:
+    import pybase64 as _b64  # SIMD-accelerated, same API as base64
+except ImportError:
+    import base64 as _b64
+
+logger = logging.getLogger(__name__)
+
+# Splits a batched completion on its "[1]", "[2]", ... answer markers
+_BATCH_MARKER_RE = re.compile(r"^\s*\[(\d+)\]\s*", re.MULTILINE)
+
+BATCH_INSTRUCTIONS = (
+    "Answer each of the following {count} requests independently. "
+    "Start each answer on a new line with the request's index in square "
+    "brackets, e.g. [1], and do not add anything else.\n\n"
+)
+
+# Image inputs that are passed through as URLs rather than read from disk
+_URL_RE = re.compile(r"^https?://", re.IGNORECASE)
+
+# Matches a {name} placeholder; names may contain anything but braces
+# (memory keys can be namespaced like "user.prefs").
+_VAR_RE = re.compile(r"\{([^{}]+)\}")
+
+
+@lru_cache(maxsize=256)
+def _compile_template(template: str) -> tuple:
+    """Split a prompt template into ("lit", text) and ("var", name) segments."""
+    if "{" not in template:
+        return (("lit", template),) if template else ()
+    segments = []
+    pos = 0
+    for match in _VAR_RE.finditer(template):
+        if match.start() > pos:
+            segments.append(("lit", template[pos:match.start()]))
+        segments.append(("var", match.group(1)))
+        pos = match.end()
+    if pos < len(template):
+        segments.append(("lit", template[pos:]))
+    return tuple(segments)
+
+
+def _dump_json(value) -> str:
+    return json.dumps(value, ensure_ascii=False)
+
+
+def _stringify_other(value) -> str:
+    # Handle complex types (dict/list subclasses included)
+    if isinstance(value, (dict, list)):
+        return _dump_json(value)
+    return str(value)
+
+
+# Exact-type dispatch for the common cases; everything else takes the
+# isinstance path.
+_STRINGIFIERS = {
+    str: lambda value: value,
+    int: str,
+    float: str,
+    bool: str,
+    dict: _dump_json,
+    list: _dump_json,
+}
+
+
+def _stringify(value) -> str:
+    return _STRINGIFIERS.get(type(value), _stringify_other)(value)
+
+
+def _render_template(segments: tuple, context, rendered: dict = None) -> str:
+    """Render compiled segments in one pass; unknown placeholders are kept as-is.
+
+    `rendered` memoizes stringified values so templates rendered against the
+    same context (prompt and image) convert each referenced value only once.
+    """
+    if not segments:
+        return ""
+    if len(segments) == 1 and segments[0][0] == "lit":
+        # Static template: nothing to substitute
+        return segments[0][1]
+    if rendered is None:
+        rendered = {}
+    parts = []
+    for kind, text in segments:
+        if kind == "lit":
+            parts.append(text)
+            continue
+        value = rendered.get(text)
+        if value is None:
+            if text in context:
+                value = _stringify(context[text])
+            else:
+                value = "{" + text + "}"
+            rendered[text] = value
+        parts.append(value)
+    return "".join(parts)
+
+
+@lru_cache(maxsize=32)
+def _encode_image_cached(image_path: str, mtime_ns: int, size: int) -> str:
+    """Image file as a base64 data URL; the stat fields key out stale entries.
+    The whole URL is cached so repeat calls do not copy the payload again."""
+    with open(image_path, "rb") as image_file:
+        encoded = _b64.b64encode(image_file.read())
+    return (b"data:image/jpeg;base64," + encoded).decode("ascii")
 
 
 class LLMNode(BasePlatformNode, Node):
@@ -28,8 +143,33 @@ class LLMNode(BasePlatformNode, Node):
         "use_history": "boolean",   # Enable chat history
         "conversation_id": "string", # Unique ID for conversation (default: "default")
         "max_history": "int",        # Max messages to keep (default: 10)
-        "time_out": "int"          # Request timeout in seconds
+        "time_out": "int",         # Request timeout in seconds
+        "batch_group": "string",   # Sibling LLM nodes with the same group share one request
+        "concurrent": "boolean",   # Run alongside sibling LLM branches (which then can't see each other's output)
+        "stream": "boolean"        # Stream tokens as llm_token events
     }
+
+    # OpenAI clients shared across nodes, keyed by (api_base, api_key, time_out).
+    # All of them sit on the shared httpx connection pool.
+    _CLIENT_CACHE = {}
+    _CLIENT_LOCK = threading.Lock()
+
+    # Default cap on in-flight requests for aexec_many()
+    MAX_CONCURRENCY = 10
+
+    def _get_client(self):
+        key = (self.api_base, self.api_key, self.time_out)
+        with LLMNode._CLIENT_LOCK:
+            client = LLMNode._CLIENT_CACHE.get(key)
+            if client is None:
+                client = openai.OpenAI(
+                    base_url=self.api_base,
+                    api_key=self.api_key,
+                    timeout=self.time_out,
+                    http_client=get_httpx_client(),
+                )
+                LLMNode._CLIENT_CACHE[key] = client
+        return client
     
     def prep(self, shared):
         cfg = getattr(self, 'config', {})
@@ -40,8 +180,12 @@ class LLMNode(BasePlatformNode, Node):
         self.model = cfg.get("model") or shared.get("llm_model") or config.LLM_MODEL
         
         self.system_prompt = cfg.get("system_prompt", "You are a helpful assistant.")
+        # Shared by every request this node (or its batch) sends
+        self._system_message = {"role": "system", "content": self.system_prompt}
         self.user_prompt_template = cfg.get("user_prompt", "{input}")
         self.image_template = cfg.get("image", "") # Optional image input
+        self._user_segments = _compile_template(self.user_prompt_template)
+        self._image_segments = _compile_template(self.image_template)
         self.temperature = float(cfg.get("temperature", 0.7))
         self.time_out = int(cfg.get("time_out", 600))
         
@@ -49,171 +193,328 @@ class LLMNode(BasePlatformNode, Node):
         self.use_history = cfg.get("use_history", False)
         self.conversation_id = cfg.get("conversation_id", "default") or "default"
         self.max_history = int(cfg.get("max_history", 10) or 10)
+        self.batch_group = (cfg.get("batch_group") or "").strip()
+        self.stream = bool(cfg.get("stream", False))
         
-        # Build Context from multiple sources
-        context = {}
+        # Event broadcasting hooks, looked up once per run
+        self._callback = getattr(self, "on_event", None)
+        self._node_id = getattr(self, "id", "unknown")
         
-        # 1. "input": result of the predecessor node
+        # Build Context from multiple sources, without copying them.
+        # Lookup order: session memory, then "input" (result of the
+        # predecessor node), then persistent memory. Writes go to the
+        # leading empty map so the sources are never modified.
         results = shared.get("results", {})
         if results:
-            last_key = list(results.keys())[-1]
-            context['input'] = results[last_key]
+            last_key = next(reversed(results))
+            input_value = results[last_key]
         else:
-            context['input'] = ""
-        
-        # 2. Session memory (in-memory)
-        if "memory" in shared and isinstance(shared["memory"], dict):
-            context.update(shared["memory"])
+            input_value = ""
         
-        # 3. Persistent memory (from file) - NEW
-        persistent_data = self._load_persistent()
-        for key, value in persistent_data.items():
-            if key not in context:  # Don't override session memory
-                context[key] = value
+        memory = shared.get("memory")
+        if not isinstance(memory, dict):
+            memory = {}
         
-        # 4. Load chat history if enabled
-        history = []
-        if self.use_history:
-            history = self._load_history(self.conversation_id)
+        context = ChainMap({}, memory, {"input": input_value}, self._load_persistent())
         
+        # Chat history is loaded in exec, only once a request is actually sent
         return {
             "context": context,
-            "history": history,
             "shared": shared
         }
 
     def _encode_image(self, image_path):
-        import base64
-        with open(image_path, "rb") as image_file:
-            return base64.b64encode(image_file.read()).decode('utf-8')
+        st = os.stat(image_path)
+        return _encode_image_cached(image_path, st.st_mtime_ns, st.st_size)
 
     def exec(self, prep_res):
-        context = prep_res["context"]
-        history = prep_res["history"]
-        
-        print(f"DEBUG LLMNode: context_keys={list(context.keys())}")
-        
-        # Build user content with variable substitution
-        user_content = self.user_prompt_template
-        image_input = self.image_template
-        
-        for key, value in context.items():
-            # Handle complex types
-            if isinstance(value, (dict, list)):
-                value = json.dumps(value, ensure_ascii=False)
-            
-            replacement = str(value)
-            user_content = user_content.replace(f"{{{key}}}", replacement)
-            if image_input:
-                image_input = image_input.replace(f"{{{key}}}", replacement)
-        
-        print(f"DEBUG LLMNode: final_content='{user_content[:100]}...'")
-        
-        # Get callback for event broadcasting
-        callback = getattr(self, "on_event", None)
-        node_id = getattr(self, "id", "unknown")
+        user_content, image_input = self._render_prompts(prep_res["context"])
         
         try:
-            client = openai.OpenAI(base_url=self.api_base, api_key=self.api_key, timeout=self.time_out)
-            
-            # Build messages list
-            messages = [{"role": "system", "content": self.system_prompt}]
+            client = self._get_client()
+            messages = self._build_messages(user_content, image_input)
+            self._emit_llm_call(user_content, messages)
             
-            # Add history if enabled
-            if self.use_history and history:
-                messages.extend(history)
+            start_time = time.time()
             
-            # Add current user message
-            if image_input and (image_input.startswith("http") or os.path.exists(image_input)):
-                # Multi-modal payload
-                content_payload = [{"type": "text", "text": user_content}]
-                
-                if image_input.startswith("http"):
-                    image_url = image_input
-                    print(f"Using image URL: {image_url}")
-                    content_payload.append({
-                        "type": "image_url",
-                        "image_url": {"url": image_url}
-                    })
-                else: 
-                    # Local file
-                    try:
-                        base64_image = self._encode_image(image_input)
-                        print(f"Encoded local image: {image_input}")
-                        content_payload.append({
-                            "type": "image_url",
-                            "image_url": {"url": f"data:image/jpeg;base64,{base64_image}"}
-                        })
-                    except Exception as img_err:
-                        print(f"Failed to encode image: {img_err}")
-                        # Fallback to just text if image fails
-                
-                messages.append({"role": "user", "content": content_payload})
+            if self.stream:
+                content = self._stream_completion(client, messages, self._callback, self._node_id)
             else:
-                # Standard text payload
-                messages.append({"role": "user", "content": user_content})
-            
-            print(f"Sending request to {self.api_base} with model {self.model} ({len(messages)} messages)")
+                content = self._complete(client, messages)
             
-            # Broadcast llm_call event
-            if callback:
-                try:
-                    # Truncate prompt preview for display
-                    prompt_preview = user_content[:500] + ("..." if len(user_content) > 500 else "")
-                    callback("llm_call", {
-                        "node_id": node_id,
-                        "model": self.model,
-                        "prompt_preview": prompt_preview,
-                        "message_count": len(messages)
-                    })
-                except Exception as e:
-                    print(f"llm_call callback error: {e}")
+            return self._exec_result(content, user_content, start_time)
+        except Exception as e:
+            return self._error_result(e, user_content)
+
+    async def aexec(self, prep_res, client):
+        """Async exec() against an openai.AsyncOpenAI client (see aexec_many)."""
+        if self.stream:
+            # Token streaming stays on the sync path
+            return await asyncio.to_thread(self.exec, prep_res)
+        
+        user_content, image_input = self._render_prompts(prep_res["context"])
+        
+        try:
+            messages = self._build_messages(user_content, image_input)
+            self._emit_llm_call(user_content, messages)
             
-            import time
             start_time = time.time()
-            
-            response = client.chat.completions.create(
+            raw = await client.chat.completions.with_raw_response.create(
                 model=self.model,
                 messages=messages,
                 temperature=self.temperature
             )
+            content = _json.loads(raw.content)["choices"][0]["message"]["content"]
             
-            duration_ms = int((time.time() - start_time) * 1000)
-            content = response.choices[0].message.content
-            print(f"LLMNode response: {content[:100]}...")
+            return self._exec_result(content, user_content, start_time)
+        except Exception as e:
+            return self._error_result(e, user_content)
+
+    @classmethod
+    async def aexec_many(cls, nodes: list, preps: list, max_concurrency: int = None) -> list:
+        """
+        Run prepared nodes concurrently, at most `max_concurrency` requests at
+        a time. Returns exec() results aligned with `nodes`.
+        """
+        semaphore = asyncio.Semaphore(max_concurrency or cls.MAX_CONCURRENCY)
+        # Async connection pools are tied to the running event loop, so the
+        # clients live only as long as this call.
+        clients = {}
+        
+        async def guarded(node, prep_res):
+            key = (node.api_base, node.api_key, node.time_out)
+            client = clients.get(key)
+            if client is None:
+                client = clients[key] = openai.AsyncOpenAI(
+                    base_url=node.api_base,
+                    api_key=node.api_key,
+                    timeout=node.time_out,
+                    http_client=new_async_httpx_client(),
+                )
+            async with semaphore:
+                return await node.aexec(prep_res, client)
+        
+        try:
+            return await asyncio.gather(*(guarded(n, p) for n, p in zip(nodes, preps)))
+        finally:
+            for client in clients.values():
+                await client.close()
+
+    def _render_prompts(self, context) -> tuple:
+        """Return (user_content, image_input) rendered against the context."""
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("LLMNode context_keys=%s", list(context.keys()))
+        
+        # Build user content with variable substitution
+        rendered = {}
+        user_content = _render_template(self._user_segments, context, rendered)
+        image_input = _render_template(self._image_segments, context, rendered)
+        
+        logger.debug("LLMNode final_content='%.100s...'", user_content)
+        return user_content, image_input
+
+    def _build_messages(self, user_content: str, image_input: str) -> list:
+        # Build the current user message
+        is_url = bool(image_input) and _URL_RE.match(image_input) is not None
+        if is_url or (image_input and os.path.exists(image_input)):
+            # Multi-modal payload
+            content_payload = [{"type": "text", "text": user_content}]
             
-            # Broadcast llm_response event
-            if callback:
+            if is_url:
+                image_url = image_input
+                logger.debug("Using image URL: %s", image_url)
+                content_payload.append({
+                    "type": "image_url",
+                    "image_url": {"url": image_url}
+                })
+            else: 
+                # Local file
                 try:
-                    # Send full response (frontend can handle display)
-                    callback("llm_response", {
-                        "node_id": node_id,
-                        "node_name": getattr(self, "name", node_id),
-                        "model": self.model,
-                        "response": content,  # Full response
-                        "duration_ms": duration_ms
+                    data_url = self._encode_image(image_input)
+                    logger.debug("Encoded local image: %s", image_input)
+                    content_payload.append({
+                        "type": "image_url",
+                        "image_url": {"url": data_url}
                     })
-                except Exception as e:
-                    print(f"llm_response callback error: {e}")
+                except Exception as img_err:
+                    logger.warning("Failed to encode image: %s", img_err)
+                    # Fallback to just text if image fails
             
-            return {
-                "response": content,
-                "user_message": user_content,
-                "success": True
-            }
+            user_message = {"role": "user", "content": content_payload}
+        else:
+            # Standard text payload
+            user_message = {"role": "user", "content": user_content}
+        
+        # System prompt, history if enabled, then the user message
+        history = self._load_history(self.conversation_id) if self.use_history else ()
+        messages = [self._system_message, *history, user_message]
+        
+        logger.info("Sending request to %s with model %s (%d messages)", self.api_base, self.model, len(messages))
+        return messages
+
+    def _emit_llm_call(self, user_content: str, messages: list):
+        """Broadcast the llm_call event."""
+        callback = self._callback
+        if not callback:
+            return
+        try:
+            # Truncate prompt preview for display
+            prompt_preview = user_content[:500] + ("..." if len(user_content) > 500 else "")
+            callback("llm_call", {
+                "node_id": self._node_id,
+                "model": self.model,
+                "prompt_preview": prompt_preview,
+                "message_count": len(messages)
+            })
         except Exception as e:
-            print(f"LLMNode Error: {e}")
-            return {
-                "response": f"Error: {str(e)}",
-                "user_message": user_content,
-                "success": False
-            }
+            logger.error("llm_call callback error: %s", e)
+
+    def _exec_result(self, content: str, user_content: str, start_time: float) -> dict:
+        """Broadcast llm_response and build the success result."""
+        duration_ms = int((time.time() - start_time) * 1000)
+        logger.debug("LLMNode response: %.100s...", content)
+        
+        callback = self._callback
+        if callback:
+            node_id = self._node_id
+            try:
+                # Send full response (frontend can handle display)
+                callback("llm_response", {
+                    "node_id": node_id,
+                    "node_name": getattr(self, "name", node_id),
+                    "model": self.model,
+                    "response": content,  # Full response
+                    "duration_ms": duration_ms
+                })
+            except Exception as e:
+                logger.error("llm_response callback error: %s", e)
+        
+        return {
+            "response": content,
+            "user_message": user_content,
+            "success": True
+        }
+
+    @staticmethod
+    def _error_result(error: Exception, user_content: str) -> dict:
+        logger.error("LLMNode Error: %s", error)
+        return {
+            "response": f"Error: {str(error)}",
+            "user_message": user_content,
+            "success": False
+        }
+
+    def _complete(self, client, messages) -> str:
+        """Request a completion and return its text.
+
+        Reads the content straight from the raw JSON body instead of letting
+        the SDK build a validated ChatCompletion model we would discard.
+        """
+        raw = client.chat.completions.with_raw_response.create(
+            model=self.model,
+            messages=messages,
+            temperature=self.temperature
+        )
+        data = _json.loads(raw.content)
+        return data["choices"][0]["message"]["content"]
+
+    def _stream_completion(self, client, messages, callback, node_id) -> str:
+        """Request a streamed completion, emitting each delta as an llm_token event."""
+        stream = client.chat.completions.create(
+            model=self.model,
+            messages=messages,
+            temperature=self.temperature,
+            stream=True
+        )
+        parts = []
+        for chunk in stream:
+            if not chunk.choices:
+                continue
+            delta = chunk.choices[0].delta.content
+            if not delta:
+                continue
+            parts.append(delta)
+            if callback:
+                try:
+                    callback("llm_token", {"node_id": node_id, "delta": delta})
+                except Exception as e:
+                    logger.error("llm_token callback error: %s", e)
+        return "".join(parts)
+
+    @classmethod
+    def batch_exec(cls, peers: list, preps: list) -> list:
+        """
+        Execute prepared peer nodes, coalescing compatible ones into one request.
+
+        Peers sharing (api_base, api_key, model, system_prompt, temperature)
+        are sent as a single chat completion whose user message lists every
+        prompt as "[i] prompt"; the answer is split back on the "[i]" markers.
+        Nodes using history, images or streaming, and any answer that cannot
+        be matched to its index, fall back to a regular exec(). Returns exec()
+        results aligned with `peers`.
+        """
+        results = [None] * len(peers)
+        groups = {}
+        for i, node in enumerate(peers):
+            if node.use_history or node.image_template or node.stream:
+                results[i] = node.exec(preps[i])
+                continue
+            key = (node.api_base, node.api_key, node.model, node.system_prompt, node.temperature)
+            groups.setdefault(key, []).append(i)
+
+        for indices in groups.values():
+            if len(indices) == 1:
+                results[indices[0]] = peers[indices[0]].exec(preps[indices[0]])
+                continue
+
+            prompts = [
+                _render_template(peers[i]._user_segments, preps[i]["context"])
+                for i in indices
+            ]
+            answers = cls._request_batch(peers[indices[0]], prompts)
+
+            for pos, i in enumerate(indices):
+                answer = answers.get(pos + 1)
+                if answer is None:
+                    results[i] = peers[i].exec(preps[i])
+                else:
+                    results[i] = {
+                        "response": answer,
+                        "user_message": prompts[pos],
+                        "success": True,
+                    }
+        return results
+
+    @staticmethod
+    def _request_batch(lead, prompts: list) -> dict:
+        """Send prompts as one indexed request; returns {index: answer}."""
+        numbered = "\n\n".join(f"[{i}] {p}" for i, p in enumerate(prompts, 1))
+        messages = [
+            lead._system_message,
+            {"role": "user", "content": BATCH_INSTRUCTIONS.format(count=len(prompts)) + numbered},
+        ]
+        logger.info("Sending batched request (%d prompts) to %s with model %s", len(prompts), lead.api_base, lead.model)
+        try:
+            content = lead._complete(lead._get_client(), messages) or ""
+        except Exception as e:
+            logger.error("LLMNode batch error: %s", e)
+            return {}
+
+        answers = {}
+        parts = _BATCH_MARKER_RE.split(content)
+        # split() yields [preamble, idx, text, idx, text, ...]
+        for idx, text in zip(parts[1::2], parts[2::2]):
+            index = int(idx)
+            if 1 <= index <= len(prompts) and index not in answers:
+                answers[index] = text.strip()
+        return answers
 
     def post(self, shared, prep_res, exec_res):
         """Store result and update chat history if enabled."""
-        print(f"DEBUG LLMNode.post: exec_res keys={list(exec_res.keys())}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("LLMNode.post exec_res keys=%s", list(exec_res.keys()))
         response = exec_res.get("response", "")
-        print(f"DEBUG LLMNode.post: response length={len(response)}")
+        logger.debug("LLMNode.post response length=%d", len(response))
         
         # Update chat history if enabled
         if self.use_history and exec_res.get("success"):
@@ -229,51 +530,31 @@ class LLMNode(BasePlatformNode, Node):
                     self.max_history
                 )
             except Exception as e:
-                print(f"LLMNode.post Warning: Failed to save history: {e}")
+                logger.warning("LLMNode.post: Failed to save history: %s", e)
         
         # Store response for downstream nodes
-        print(f"DEBUG LLMNode.post: calling super().post with response type {type(response)}")
+        logger.debug("LLMNode.post calling super().post with response type %s", type(response))
         super().post(shared, prep_res, response)
         return None
 
     def _load_persistent(self) -> dict:
-        """Load persistent memory from JSON file."""
-        if os.path.exists(config.MEMORY_FILE):
-            try:
-                with open(config.MEMORY_FILE, "r", encoding="utf-8") as f:
-                    return json.load(f)
-            except (json.JSONDecodeError, IOError):
-                return {}
-        return {}
+        """Snapshot of persistent memory (shared with MemoryNode)."""
+        return memory_store.read()
 
     def _load_history(self, conversation_id: str) -> list:
         """Load chat history for a conversation."""
-        data = self._load_persistent()
-        history_key = f"_chat_history_{conversation_id}"
-        return data.get(history_key, [])
+        return history_store.get(conversation_id)
 
     def _save_history(self, conversation_id: str, user_msg: str, assistant_msg: str, max_history: int):
         """Save chat history, respecting max_history limit."""
-        data = self._load_persistent()
-        history_key = f"_chat_history_{conversation_id}"
-        
-        history = data.get(history_key, [])
+        # Bounded to max_history turns (two messages each); the oldest messages
+        # fall off as new ones are appended. Building a new deque also keeps
+        # the stored history list from being mutated in place.
+        history = deque(history_store.get(conversation_id), maxlen=max_history * 2)
         
         # Append new messages
         history.append({"role": "user", "content": user_msg})
         history.append({"role": "assistant", "content": assistant_msg})
         
-        # Trim to max_history (max_history is number of turns, so multiply by 2 for messages)
-        max_messages = max_history * 2
-        if len(history) > max_messages:
-            history = history[-max_messages:]
-        
-        data[history_key] = history
-        
-        # Save back to file
-        try:
-            with open(config.MEMORY_FILE, "w", encoding="utf-8") as f:
-                json.dump(data, f, indent=2, ensure_ascii=False)
-        except IOError as e:
-            print(f"Error saving chat history: {e}")
-
+        # Written to the conversation's own file by the store's background flush
+        history_store.set(conversation_id, list(history))
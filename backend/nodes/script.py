@@ -1,10 +1,245 @@
 import subprocess
 import os
+import io
+import sys
 import json
+import time
+import atexit
+import signal
+import shutil
+import secrets
+import selectors
 import tempfile
+import threading
+import traceback
+from functools import lru_cache
 from .base import BasePlatformNode
 from pocketflow import Node
 
+SCRIPT_TIMEOUT = 30  # seconds
+
+
+class _ThreadRouter:
+    """
+    Stand-in for sys.stdin/stdout/stderr. Calls made from a thread running an
+    in-process script go to that script's own stream; everything else goes
+    to the original stream.
+    """
+
+    def __init__(self, original):
+        self._original = original
+        self._streams = {}
+
+    def _current(self):
+        return self._streams.get(threading.get_ident(), self._original)
+
+    def __getattr__(self, name):
+        return getattr(self._current(), name)
+
+    def __iter__(self):
+        return iter(self._current())
+
+
+_router_lock = threading.Lock()
+
+
+def _router(name: str) -> _ThreadRouter:
+    with _router_lock:
+        stream = getattr(sys, name)
+        if not isinstance(stream, _ThreadRouter):
+            stream = _ThreadRouter(stream)
+            setattr(sys, name, stream)
+        return stream
+
+
+@lru_cache(maxsize=256)
+def _compile_script(script_body: str):
+    """Compiled code for a script body, reused across runs of the same script."""
+    return compile(script_body, "<script>", "exec")
+
+
+def _run_python_inproc(script_body: str, input_val: str, use_stdin: bool):
+    """
+    Run Python code in this process; returns (stdout, stderr, exit_code).
+
+    The code runs in a daemon thread so the caller can give up after
+    SCRIPT_TIMEOUT (raising subprocess.TimeoutExpired); a runaway script
+    cannot be killed and keeps running in the background.
+    """
+    streams = {
+        "stdin": io.StringIO(input_val if use_stdin else ""),
+        "stdout": io.StringIO(),
+        "stderr": io.StringIO(),
+    }
+    result = {"exit_code": 1}
+
+    def target():
+        ident = threading.get_ident()
+        routers = {name: _router(name) for name in streams}
+        for name, router in routers.items():
+            router._streams[ident] = streams[name]
+        try:
+            code = _compile_script(script_body)
+            exec(code, {"__name__": "__main__", "POCKETFLOW_INPUT": input_val})
+            result["exit_code"] = 0
+        except SystemExit as e:
+            if e.code is None or isinstance(e.code, int):
+                result["exit_code"] = e.code or 0
+            else:
+                print(e.code, file=streams["stderr"])
+        except BaseException:
+            # Report from the script's frames down, like a standalone run
+            exc_type, exc, tb = sys.exc_info()
+            traceback.print_exception(exc_type, exc, tb.tb_next, file=streams["stderr"])
+        finally:
+            for router in routers.values():
+                router._streams.pop(ident, None)
+
+    worker = threading.Thread(target=target, name="script-inproc", daemon=True)
+    worker.start()
+    worker.join(SCRIPT_TIMEOUT)
+    if worker.is_alive():
+        raise subprocess.TimeoutExpired("<script>", SCRIPT_TIMEOUT)
+
+    return streams["stdout"].getvalue(), streams["stderr"].getvalue(), result["exit_code"]
+
+
+# Shell loop run by persistent bash workers. For each run the caller writes the
+# script and its input to files in the worker's directory (read back in one
+# buffered read each, unlike a pipe which bash reads a byte at a time) and
+# sends the input mode as one line. Each script is evaluated in a subshell, so
+# cwd, variables and traps never leak between runs; the worker's own
+# variables are unset first. Every run ends with "\0<token>:<exit code>\n" on
+# stdout and "\0<token>\n" on stderr.
+_BASH_WORKER_LOOP = r"""
+__pf_hide='unset __pf_script __pf_mode __pf_status __pf_hide __PF_TOKEN __PF_DIR;'
+while IFS= read -r __pf_mode; do
+  IFS= read -r -d '' __pf_script < "$__PF_DIR/script"
+  case "$__pf_mode" in
+    stdin) ( eval "$__pf_hide $__pf_script" ) < "$__PF_DIR/input" ;;
+    env) ( IFS= read -r -d '' POCKETFLOW_INPUT < "$__PF_DIR/input"; export POCKETFLOW_INPUT
+           eval "$__pf_hide $__pf_script" ) < /dev/null ;;
+    *) ( eval "$__pf_hide $__pf_script" ) < /dev/null ;;
+  esac
+  __pf_status=$?
+  printf '\0%s:%d\n' "$__PF_TOKEN" "$__pf_status"
+  printf '\0%s\n' "$__PF_TOKEN" >&2
+done
+"""
+
+
+class _BashWorker:
+    """A long-lived bash process that runs scripts without a fork+exec each."""
+
+    def __init__(self):
+        self.token = secrets.token_hex(8)
+        self.dir = tempfile.mkdtemp(prefix="pf-bash-")
+        env = os.environ.copy()
+        env["__PF_TOKEN"] = self.token
+        env["__PF_DIR"] = self.dir
+        self.proc = subprocess.Popen(
+            ["bash", "-c", _BASH_WORKER_LOOP],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            env=env,
+            start_new_session=True,  # so kill() also reaches script children
+        )
+
+    def alive(self):
+        return self.proc.poll() is None
+
+    def kill(self):
+        try:
+            os.killpg(self.proc.pid, signal.SIGKILL)
+        except OSError:
+            pass
+        self.proc.wait()
+        shutil.rmtree(self.dir, ignore_errors=True)
+
+    def _write(self, name: str, text: str):
+        # Replace rather than rewrite, so a background job left over from an
+        # earlier run keeps reading its own input
+        path = os.path.join(self.dir, name)
+        with open(path + ".tmp", "wb") as f:
+            f.write(text.encode())
+        os.replace(path + ".tmp", path)
+
+    def run(self, script_body: str, input_val: str, input_mode: str, timeout: float):
+        """Run one script; returns (stdout, stderr, exit_code)."""
+        self._write("script", script_body)
+        self._write("input", input_val if input_mode in ("stdin", "env") else "")
+        self.proc.stdin.write(input_mode.replace("\n", " ").encode() + b"\n")
+        self.proc.stdin.flush()
+
+        token = self.token.encode()
+        out_marker = b"\0" + token + b":"
+        err_marker = b"\0" + token + b"\n"
+        buffers = {self.proc.stdout: bytearray(), self.proc.stderr: bytearray()}
+        exit_code = None
+        deadline = time.monotonic() + timeout
+
+        with selectors.DefaultSelector() as sel:
+            for stream in buffers:
+                sel.register(stream, selectors.EVENT_READ)
+            while sel.get_map():
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise subprocess.TimeoutExpired("bash", timeout)
+                for key, _ in sel.select(remaining):
+                    chunk = os.read(key.fd, 65536)
+                    if not chunk:
+                        raise RuntimeError("bash worker exited unexpectedly")
+                    buf = buffers[key.fileobj]
+                    buf += chunk
+                    if key.fileobj is self.proc.stdout:
+                        pos = buf.find(out_marker)
+                        end = buf.find(b"\n", pos) if pos != -1 else -1
+                        if end != -1:
+                            exit_code = int(buf[pos + len(out_marker):end])
+                            del buf[pos:]
+                            sel.unregister(key.fileobj)
+                    elif buf.endswith(err_marker):
+                        del buf[-len(err_marker):]
+                        sel.unregister(key.fileobj)
+
+        stdout, stderr = buffers.values()
+        return (
+            stdout.decode(errors="replace"),
+            stderr.decode(errors="replace"),
+            exit_code,
+        )
+
+
+_idle_bash_workers = []
+_bash_lock = threading.Lock()
+
+
+def _run_bash_worker(script_body: str, input_val: str, input_mode: str):
+    """Run a bash script on an idle worker (spawning one if needed)."""
+    with _bash_lock:
+        worker = _idle_bash_workers.pop() if _idle_bash_workers else None
+    if worker is None or not worker.alive():
+        worker = _BashWorker()
+    try:
+        result = worker.run(script_body, input_val, input_mode, SCRIPT_TIMEOUT)
+    except BaseException:
+        # Timed out or broken: never reuse it
+        worker.kill()
+        raise
+    with _bash_lock:
+        _idle_bash_workers.append(worker)
+    return result
+
+
+def _close_bash_workers():
+    with _bash_lock:
+        while _idle_bash_workers:
+            _idle_bash_workers.pop().kill()
+
+
+atexit.register(_close_bash_workers)
+
 
 class ScriptNode(BasePlatformNode, Node):
     """
@@ -38,6 +273,12 @@ class ScriptNode(BasePlatformNode, Node):
             "default": "stdout",
             "description": "What the script returns",
         },
+        "sandbox_mode": {
+            "type": "string",
+            "enum": ["auto", "subprocess", "inproc"],
+            "default": "auto",
+            "description": "'subprocess': fresh process per run. 'inproc': bash runs on a persistent shell worker (scripts are eval'd, so $0 is 'bash' rather than a script path); Python runs inside the server (fast, but no isolation or hard timeout; env input still uses a subprocess). 'auto': persistent worker for bash, subprocess for Python",
+        },
     }
 
     def prep(self, shared):
@@ -47,7 +288,7 @@ class ScriptNode(BasePlatformNode, Node):
         results = shared.get("results", {})
         last_result = ""
         if results:
-            last_key = list(results.keys())[-1]
+            last_key = next(reversed(results))
             last_result = results[last_key]
 
         # Ensure last_result is a string for stdin/env
@@ -62,6 +303,7 @@ class ScriptNode(BasePlatformNode, Node):
             "script_body": cfg.get("script_body", ""),
             "input_mode": cfg.get("input_mode", "stdin").lower(),
             "return_type": cfg.get("return_type", "stdout").lower(),
+            "sandbox_mode": cfg.get("sandbox_mode", "auto").lower(),
             "input_val": last_result,
         }
 
@@ -75,6 +317,35 @@ class ScriptNode(BasePlatformNode, Node):
         if not script_body.strip():
             return "Error: No script content provided"
 
+        sandbox_mode = prep_res.get("sandbox_mode", "auto")
+
+        # Bash on a persistent worker skips the temp file and shell startup
+        if interpreter == "bash" and sandbox_mode in ("auto", "inproc"):
+            try:
+                stdout, stderr, exit_code = _run_bash_worker(
+                    script_body, input_val, input_mode
+                )
+            except subprocess.TimeoutExpired:
+                return "Error: Script execution timed out (30s limit)"
+            except Exception as e:
+                return f"Error executing script: {str(e)}"
+            return self._format_result(stdout, stderr, exit_code, return_type)
+
+        # In-process Python skips the temp file and interpreter startup.
+        # Env input needs a real process environment, so it stays out.
+        if (
+            interpreter == "python"
+            and sandbox_mode == "inproc"
+            and input_mode != "env"
+        ):
+            try:
+                stdout, stderr, exit_code = _run_python_inproc(
+                    script_body, input_val, input_mode == "stdin"
+                )
+            except subprocess.TimeoutExpired:
+                return "Error: Script execution timed out (30s limit)"
+            return self._format_result(stdout, stderr, exit_code, return_type)
+
         # Prepare execution environment
         env = os.environ.copy()
         if input_mode == "env":
@@ -102,27 +373,12 @@ class ScriptNode(BasePlatformNode, Node):
                 capture_output=True,
                 text=True,
                 env=env,
-                timeout=30,  # Safety timeout
+                timeout=SCRIPT_TIMEOUT,  # Safety timeout
             )
 
-            result_data = {
-                "stdout": process.stdout.strip(),
-                "stderr": process.stderr.strip(),
-                "exit_code": process.returncode,
-                "success": process.returncode == 0,
-            }
-
-            # Handle return types
-            if return_type == "exit_code":
-                return process.returncode
-            elif return_type == "json":
-                return result_data
-            else:  # default stdout
-                if not result_data["success"] and not result_data["stdout"]:
-                    return (
-                        f"Error (Code {process.returncode}): {process.stderr.strip()}"
-                    )
-                return result_data["stdout"]
+            return self._format_result(
+                process.stdout, process.stderr, process.returncode, return_type
+            )
 
         except subprocess.TimeoutExpired:
             return "Error: Script execution timed out (30s limit)"
@@ -132,6 +388,25 @@ class ScriptNode(BasePlatformNode, Node):
             if os.path.exists(temp_script_path):
                 os.remove(temp_script_path)
 
+    @staticmethod
+    def _format_result(stdout, stderr, exit_code, return_type):
+        result_data = {
+            "stdout": stdout.strip(),
+            "stderr": stderr.strip(),
+            "exit_code": exit_code,
+            "success": exit_code == 0,
+        }
+
+        # Handle return types
+        if return_type == "exit_code":
+            return exit_code
+        elif return_type == "json":
+            return result_data
+        else:  # default stdout
+            if not result_data["success"] and not result_data["stdout"]:
+                return f"Error (Code {exit_code}): {result_data['stderr']}"
+            return result_data["stdout"]
+
     def post(self, shared, prep_res, exec_res):
         super().post(shared, prep_res, exec_res)
         return None
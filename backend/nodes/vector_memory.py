@@ -1,9 +1,159 @@
 import os
-import json
-import chromadb
+import time
+import logging
+import random
+import secrets
+import asyncio
+import threading
 import openai
+from functools import lru_cache
 from .base import BasePlatformNode
 from pocketflow import Node
+from ._http import get_httpx_client, new_async_httpx_client
+from . import _json
+
+logger = logging.getLogger(__name__)
+
+
+class OpenAIEmbeddingFunction:
+    """
+    Embeddings from an OpenAI-compatible API.
+
+    Chroma needs its EmbeddingFunction base; use _chroma_embedding_function()
+    so that chromadb is only imported once a collection is actually used.
+    """
+
+    # Inputs larger than this are split into chunks embedded concurrently
+    CHUNK_SIZE = 512
+    MAX_CONCURRENCY = 4
+
+    # Transient failures retried with exponential backoff
+    RETRYABLE = (openai.RateLimitError, openai.APITimeoutError, openai.APIConnectionError)
+    BACKOFF_BASE = 1.0
+
+    # Next free request slot per API base, for the requests_per_minute cap
+    _next_slot = {}
+    _slot_lock = threading.Lock()
+
+    def __init__(self, base_url, model_name, max_retries=5, requests_per_minute=0):
+        self.base_url = base_url
+        # Retries are handled here (honoring Retry-After), not by the SDK
+        self.client = openai.OpenAI(
+            base_url=base_url,
+            api_key="dummy",
+            max_retries=0,
+            http_client=get_httpx_client(),
+        )
+        self.model = model_name
+        self.max_retries = max_retries
+        self.requests_per_minute = requests_per_minute
+
+    def __call__(self, input):
+        # Ensure input is a list of strings
+        if isinstance(input, str):
+            input = [input]
+
+        try:
+            if len(input) > self.CHUNK_SIZE and not self._in_event_loop():
+                return asyncio.run(self._embed_chunks(input))
+            return self._create(input)
+        except Exception as e:
+            print(f"Embedding Error: {e}")
+            raise e
+
+    def _create(self, input):
+        for attempt in range(self.max_retries + 1):
+            time.sleep(self._reserve_slot())
+            try:
+                response = self.client.embeddings.create(input=input, model=self.model)
+                return [e.embedding for e in response.data]
+            except self.RETRYABLE as e:
+                if attempt == self.max_retries:
+                    raise
+                time.sleep(self._retry_delay(e, attempt))
+
+    async def _acreate(self, aclient, input):
+        for attempt in range(self.max_retries + 1):
+            await asyncio.sleep(self._reserve_slot())
+            try:
+                response = await aclient.embeddings.create(input=input, model=self.model)
+                return [e.embedding for e in response.data]
+            except self.RETRYABLE as e:
+                if attempt == self.max_retries:
+                    raise
+                await asyncio.sleep(self._retry_delay(e, attempt))
+
+    def _retry_delay(self, error, attempt):
+        """Seconds to wait: the server's Retry-After if given, else 1s, 2s, 4s... plus jitter."""
+        response = getattr(error, "response", None)
+        if response is not None:
+            retry_after = response.headers.get("retry-after")
+            try:
+                return max(0.0, float(retry_after))
+            except (TypeError, ValueError):
+                pass
+        delay = self.BACKOFF_BASE * 2 ** attempt + random.uniform(0, 0.5)
+        logger.warning("Embedding request failed (%s); retrying in %.1fs", error, delay)
+        return delay
+
+    def _reserve_slot(self):
+        """Claim the next request slot under requests_per_minute; returns the wait."""
+        if not self.requests_per_minute:
+            return 0.0
+        interval = 60.0 / self.requests_per_minute
+        with self._slot_lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot.get(self.base_url, now))
+            self._next_slot[self.base_url] = slot + interval
+        return slot - now
+
+    async def _embed_chunks(self, input):
+        """Embed CHUNK_SIZE slices in parallel, keeping input order."""
+        chunks = [
+            input[i : i + self.CHUNK_SIZE]
+            for i in range(0, len(input), self.CHUNK_SIZE)
+        ]
+        semaphore = asyncio.Semaphore(self.MAX_CONCURRENCY)
+        # Async pools are tied to this event loop, so the client is per call
+        async with openai.AsyncOpenAI(
+            base_url=self.base_url,
+            api_key="dummy",
+            max_retries=0,
+            http_client=new_async_httpx_client(),
+        ) as aclient:
+
+            async def embed(chunk):
+                async with semaphore:
+                    return await self._acreate(aclient, chunk)
+
+            results = await asyncio.gather(*(embed(c) for c in chunks))
+        return [embedding for chunk in results for embedding in chunk]
+
+    @staticmethod
+    def _in_event_loop():
+        try:
+            asyncio.get_running_loop()
+            return True
+        except RuntimeError:
+            return False
+
+
+def _new_doc_id() -> str:
+    """Time-ordered document ID (ns timestamp + random suffix), so inserts
+    land near each other in Chroma's SQLite indexes instead of at random."""
+    return f"{time.time_ns():016x}{secrets.token_hex(4)}"
+
+
+@lru_cache(maxsize=None)
+def _chroma_embedding_function():
+    """OpenAIEmbeddingFunction mixed into chromadb's EmbeddingFunction."""
+    import chromadb
+
+    return type(
+        "OpenAIEmbeddingFunction",
+        (OpenAIEmbeddingFunction, chromadb.EmbeddingFunction),
+        {"__module__": __name__},
+    )
 
 
 class VectorMemoryNode(BasePlatformNode, Node):
@@ -11,7 +161,7 @@ class VectorMemoryNode(BasePlatformNode, Node):
     Vector search memory using ChromaDB for RAG and episodic memory.
 
     Operations:
-    - add: Store text and metadata with automatic embeddings
+    - add: Store text (or a list of texts) and metadata with automatic embeddings
     - query: Vector search for relevant technical content
     - delete: Remove a collection or items
     - list: List all available collections
@@ -50,10 +200,52 @@ class VectorMemoryNode(BasePlatformNode, Node):
             "default": "text-embedding-3-small",
             "description": "Embedding model name",
         },
+        "split_list": {
+            "type": "boolean",
+            "default": False,
+            "description": "For 'add', store each item of a list input as its own document",
+        },
+        "batch_size": {
+            "type": "int",
+            "default": 1,
+            "description": "Buffer 'add' documents and embed them in batches of this size",
+        },
+        "max_retries": {
+            "type": "int",
+            "default": 5,
+            "description": "Retries for rate-limited or timed-out embedding requests",
+        },
+        "requests_per_minute": {
+            "type": "int",
+            "default": 0,
+            "description": "Cap on embedding requests per minute (0 = unlimited)",
+        },
     }
 
     CHROMA_PATH = "backend/.chroma_db"
 
+    # HNSW settings for new collections. Embedding APIs return normalized
+    # vectors, so cosine is the right metric. Existing collections keep
+    # whatever they were created with.
+    COLLECTION_METADATA = {
+        "hnsw:space": "cosine",
+        "hnsw:M": 32,
+        "hnsw:construction_ef": 200,
+        "hnsw:search_ef": 64,
+    }
+
+    # shared[] key holding buffered adds: {(collection, embedding): batch}
+    PENDING_KEY = "_pending_embed"
+    # shared[] flag set by engine.run_flow, which flushes once the run ends;
+    # without it (e.g. exported scripts) each node flushes in post()
+    DEFER_FLUSH_KEY = "_defer_embed_flush"
+
+    # Chroma clients by path and embedding functions by settings, shared
+    # across runs so index files and HTTP connections stay open
+    _clients = {}
+    _embed_fns = {}
+    _cache_lock = threading.Lock()
+
     def prep(self, shared):
         cfg = getattr(self, "config", {})
 
@@ -65,8 +257,13 @@ class VectorMemoryNode(BasePlatformNode, Node):
         input_text = ""
         results = shared.get("results", {})
         if results:
-            last_key = list(results.keys())[-1]
-            input_text = str(results[last_key])
+            last_key = next(reversed(results))
+            last = results[last_key]
+            # Optionally add one document per item of a list input
+            if isinstance(last, list) and cfg.get("split_list", False):
+                input_text = [str(item) for item in last]
+            else:
+                input_text = str(last)
 
         return {
             "operation": cfg.get("operation", "query").lower().strip(),
@@ -76,6 +273,14 @@ class VectorMemoryNode(BasePlatformNode, Node):
             "top_k": int(cfg.get("top_k", 3)),
             "api_base": api_base,
             "model": cfg.get("model", "text-embedding-3-small"),
+            # Arguments for _embedding_function()
+            "embedding": (
+                api_base,
+                cfg.get("model", "text-embedding-3-small"),
+                int(cfg.get("max_retries", 5)),
+                int(cfg.get("requests_per_minute", 0) or 0),
+            ),
+            "batch_size": max(1, int(cfg.get("batch_size", 1) or 1)),
             "shared": shared,
         }
 
@@ -85,68 +290,61 @@ class VectorMemoryNode(BasePlatformNode, Node):
         text = prep_res["text"]
         metadata_str = prep_res["metadata"]
         top_k = prep_res["top_k"]
-        api_base = prep_res["api_base"]
-        model = prep_res["model"]
-
-        os.makedirs(self.CHROMA_PATH, exist_ok=True)
-        client = chromadb.PersistentClient(path=self.CHROMA_PATH)
-
-        # Define embedding function using OpenAI-compatible API
-        class OpenAIEmbeddingFunction(chromadb.EmbeddingFunction):
-            def __init__(self, base_url, model_name):
-                self.client = openai.OpenAI(base_url=base_url, api_key="dummy")
-                self.model = model_name
 
-            def __call__(self, input):
-                # Ensure input is a list of strings
-                if isinstance(input, str):
-                    input = [input]
+        shared = prep_res["shared"]
 
-                try:
-                    response = self.client.embeddings.create(
-                        input=input, model=self.model
-                    )
-                    return [e.embedding for e in response.data]
-                except Exception as e:
-                    print(f"Embedding Error: {e}")
-                    raise e
-
-        # Initialize embedding function
-        embedding_function = None
-        if api_base:
-            embedding_function = OpenAIEmbeddingFunction(api_base, model)
+        client = self._get_client()
+        embedding = prep_res["embedding"]
+        embedding_function = self._embedding_function(*embedding)
 
         try:
             if op == "add":
                 if not text:
                     return {"success": False, "message": "No text provided to add"}
 
-                collection = client.get_or_create_collection(
-                    name=col_name, embedding_function=embedding_function
-                )
+                texts = text if isinstance(text, list) else [text]
 
                 # Parse metadata
                 metadata = {}
                 try:
-                    metadata = json.loads(metadata_str)
-                except:
+                    metadata = _json.loads(metadata_str)
+                except (_json.JSONDecodeError, TypeError, ValueError):
                     pass
 
-                # Use a simple hash or UUID for ID
-                import uuid
+                doc_ids = [_new_doc_id() for _ in texts]
 
-                doc_id = str(uuid.uuid4())
+                # Buffer the documents; a full batch is embedded in one request
+                pending = shared.setdefault(self.PENDING_KEY, {})
+                batch = pending.setdefault(
+                    (col_name, embedding),
+                    {"documents": [], "metadatas": [], "ids": []},
+                )
+                batch["documents"].extend(texts)
+                # Chroma rejects empty metadata dicts; None means "no metadata"
+                batch["metadatas"].extend(
+                    (dict(metadata) if metadata else None) for _ in texts
+                )
+                batch["ids"].extend(doc_ids)
+                if len(batch["ids"]) >= prep_res["batch_size"]:
+                    self.flush_pending(shared)
 
-                collection.add(documents=[text], metadatas=[metadata], ids=[doc_id])
-                return {
+                result = {
                     "success": True,
                     "message": f"Added to '{col_name}'",
-                    "id": doc_id,
+                    "id": doc_ids[0],
                 }
+                if len(doc_ids) > 1:
+                    result["ids"] = doc_ids
+                return result
 
-            elif op == "query":
+            # Later operations must see every document added so far
+            self.flush_pending(shared)
+
+            if op == "query":
                 if not text:
                     return {"success": False, "message": "No query text provided"}
+                if isinstance(text, list):
+                    text = "\n".join(text)
 
                 try:
                     collection = client.get_collection(
@@ -192,6 +390,56 @@ class VectorMemoryNode(BasePlatformNode, Node):
             traceback.print_exc()
             return {"success": False, "error": str(e)}
 
+    @classmethod
+    def _get_client(cls):
+        path = cls.CHROMA_PATH
+        with cls._cache_lock:
+            client = cls._clients.get(path)
+            if client is None:
+                os.makedirs(path, exist_ok=True)
+                import chromadb
+
+                client = cls._clients[path] = chromadb.PersistentClient(path=path)
+        return client
+
+    @classmethod
+    def _embedding_function(cls, api_base, model, max_retries=5, requests_per_minute=0):
+        if not api_base:
+            return None
+        key = (api_base, model, max_retries, requests_per_minute)
+        with cls._cache_lock:
+            fn = cls._embed_fns.get(key)
+            if fn is None:
+                fn = cls._embed_fns[key] = _chroma_embedding_function()(*key)
+        return fn
+
+    @classmethod
+    def flush_pending(cls, shared):
+        """
+        Add all buffered documents, one collection.add() call per collection.
+        A failed batch is put back in the buffer and the error re-raised, so
+        documents already reported as added are never dropped silently.
+        """
+        pending = shared.get(cls.PENDING_KEY)
+        if not pending:
+            return
+        client = cls._get_client()
+        while pending:
+            (col_name, embedding), batch = pending.popitem()
+            if not batch["ids"]:
+                continue
+            try:
+                collection = client.get_or_create_collection(
+                    name=col_name,
+                    embedding_function=cls._embedding_function(*embedding),
+                    metadata=cls.COLLECTION_METADATA,
+                )
+                collection.add(**batch)
+            except Exception as e:
+                pending[(col_name, embedding)] = batch
+                logger.error("Error adding %d documents to '%s': %s", len(batch["ids"]), col_name, e)
+                raise
+
     def post(self, shared, prep_res, exec_res):
         # We prefer to return the results list if it's a query
         if prep_res["operation"] == "query" and exec_res.get("success"):
@@ -206,4 +454,7 @@ class VectorMemoryNode(BasePlatformNode, Node):
         else:
             super().post(shared, prep_res, exec_res)
 
+        if not shared.get(self.DEFER_FLUSH_KEY):
+            self.flush_pending(shared)
+
         return None
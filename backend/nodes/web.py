@@ -1,12 +1,111 @@
 from .base import BasePlatformNode
 from pocketflow import Node
+import re
+import asyncio
+import logging
+import httpx
+import time
+import threading
 import requests
-from bs4 import BeautifulSoup
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from functools import lru_cache
 
-try:
-    from tavily import TavilyClient
-except ImportError:
-    TavilyClient = None
+logger = logging.getLogger(__name__)
+
+# bs4, feedparser, lxml, selectolax and tavily are imported on first use, so loading the
+# node registry does not pay for parsers a workflow may never touch.
+
+
+@lru_cache(maxsize=None)
+def _lxml_etree():
+    """lxml.etree if installed, else None. Its C parsers are much faster than
+    html.parser and feedparser."""
+    try:
+        from lxml import etree
+    except ImportError:
+        return None
+    return etree
+
+
+@lru_cache(maxsize=None)
+def _lexbor_parser():
+    """selectolax's LexborHTMLParser if installed, else None. It extracts text
+    from a C tree without building a Python one, well ahead of BeautifulSoup."""
+    try:
+        from selectolax.lexbor import LexborHTMLParser
+    except ImportError:
+        return None
+    return LexborHTMLParser
+
+
+@lru_cache(maxsize=None)
+def _lxml_html():
+    """lxml.html if installed, else None."""
+    try:
+        from lxml import html
+    except ImportError:
+        return None
+    return html
+
+
+def _html_parser():
+    return "lxml" if _lxml_etree() is not None else "html.parser"
+
+
+DEFAULT_USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
+
+# (connect, read) seconds
+HTTP_TIMEOUT = (5, 15)
+
+# Shared session so repeated fetches reuse keep-alive connections (and skip
+# the TLS handshake) instead of opening a new socket per request
+_SESSION = requests.Session()
+_SESSION.headers["User-Agent"] = DEFAULT_USER_AGENT
+_adapter = HTTPAdapter(
+    pool_connections=32,
+    pool_maxsize=64,
+    max_retries=Retry(total=2, backoff_factor=0.3, status_forcelist=(502, 503, 504)),
+)
+_SESSION.mount("http://", _adapter)
+_SESSION.mount("https://", _adapter)
+
+
+def _conditional_headers(etag, modified):
+    """Revalidation headers for a cached response."""
+    headers = {}
+    if etag:
+        headers["If-None-Match"] = etag
+    if modified:
+        headers["If-Modified-Since"] = modified
+    return headers
+
+
+# {placeholder}; any name without braces, like the memory keys it refers to
+_VAR_RE = re.compile(r"\{([^{}]+)\}")
+
+
+def _substitute(template: str, context: dict) -> str:
+    """Fill {key} placeholders from context in one regex pass; unknown
+    placeholders are left as-is."""
+    if "{" not in template:
+        return template
+
+    def replace(match):
+        key = match.group(1)
+        return str(context[key]) if key in context else match.group(0)
+
+    return _VAR_RE.sub(replace, template)
+
+
+# Elements whose text is never part of a fetched page's content
+_DROPPED_TAGS = ["script", "style", "nav", "footer", "header"]
+
+# Whitespace runs within a line, and any whitespace spanning a line break
+_WS_RE = re.compile(r"[ \t\x0b\f\r]+")
+_NL_RE = re.compile(r" ?\n\s*")
 
 
 class WebSearchNode(BasePlatformNode, Node):
@@ -39,16 +138,40 @@ class WebSearchNode(BasePlatformNode, Node):
             "default": False,
             "description": "Return results as list for Loop compatibility",
         },
+        "fetch_inline": {
+            "type": "boolean",
+            "default": False,
+            "description": "Also fetch each result page (in parallel) and attach its text as 'body'",
+        },
+        "fetch_concurrency": {
+            "type": "int",
+            "default": 8,
+            "description": "Maximum pages fetched at once when fetch_inline is on",
+        },
     }
 
+    # Characters of page text kept per result when fetch_inline is on
+    INLINE_FETCH_CHARS = 5000
+
+    # (query, search_depth, max_results) -> (expires_at, response), so loops
+    # repeating a query within SEARCH_CACHE_TTL seconds skip the API call
+    _SEARCH_CACHE = OrderedDict()
+    _SEARCH_CACHE_LOCK = threading.Lock()
+    SEARCH_CACHE_SIZE = 256
+    SEARCH_CACHE_TTL = 300
+
+    # Tavily clients shared across nodes and runs, keyed by API key
+    _CLIENT_CACHE = {}
+    _CLIENT_LOCK = threading.Lock()
+
     def prep(self, shared):
         cfg = getattr(self, "config", {})
 
         # Build context for variable substitution
         context = {}
-        results = shared.get("results", {})
+        results = shared.get("results")
         if results:
-            last_key = list(results.keys())[-1]
+            last_key = next(reversed(results))
             context["input"] = results[last_key]
 
         if "memory" in shared:
@@ -60,6 +183,8 @@ class WebSearchNode(BasePlatformNode, Node):
             "max_results": int(cfg.get("max_results", 5) or 5),
             "search_depth": cfg.get("search_depth", "basic"),
             "as_list": cfg.get("as_list", False),
+            "fetch_inline": cfg.get("fetch_inline", False),
+            "fetch_concurrency": int(cfg.get("fetch_concurrency", 8) or 8),
             "context": context,
         }
 
@@ -72,8 +197,7 @@ class WebSearchNode(BasePlatformNode, Node):
         context = prep_res["context"]
 
         # Variable substitution
-        for key, value in context.items():
-            query = query.replace(f"{{{key}}}", str(value))
+        query = _substitute(query, context)
 
         # Use input as query if param is empty
         if not query and "input" in context:
@@ -82,7 +206,9 @@ class WebSearchNode(BasePlatformNode, Node):
         if not query:
             return {"error": "No query provided", "results": []}
 
-        if TavilyClient is None:
+        try:
+            from tavily import TavilyClient
+        except ImportError:
              return {"error": "tavily-python not installed", "results": []}
 
         try:
@@ -101,45 +227,96 @@ class WebSearchNode(BasePlatformNode, Node):
             if not api_key:
                  return {"error": "Missing Tavily API Key", "results": []}
 
-            client = TavilyClient(api_key=api_key)
-            
-            response = client.search(
-                query=query,
-                search_depth=search_depth,
-                max_results=max_results
-            )
-            
+            cache_key = (query, search_depth, max_results)
+            response = self._cached_search(cache_key)
+            if response is None:
+                client = self._get_client(TavilyClient, api_key)
+
+                response = client.search(
+                    query=query,
+                    search_depth=search_depth,
+                    max_results=max_results
+                )
+                self._store_search(cache_key, response)
+
             # Tavily returns a dict with 'results' list
             raw_results = response.get("results", [])
 
-            # Structure results
-            results = []
-            for r in raw_results:
-                results.append(
-                    {
+            if prep_res.get("fetch_inline") and raw_results:
+                bodies = self._fetch_bodies(
+                    [r.get("url", "") for r in raw_results], prep_res["fetch_concurrency"]
+                )
+            else:
+                bodies = [None] * len(raw_results)
+
+            # Build only the output that was asked for
+            if as_list:
+                results = []
+                for r, body in zip(raw_results, bodies):
+                    item = {
                         "title": r.get("title", ""),
                         "url": r.get("url", ""),
                         "snippet": r.get("content", ""),
                     }
-                )
-
-            if as_list:
+                    if body is not None:
+                        item["body"] = body
+                    results.append(item)
                 return {"results": results, "count": len(results), "query": query}
-            else:
-                # Format as text for backward compatibility
-                formatted = ""
-                for r in results:
-                    formatted += f"Title: {r['title']}\nLink: {r['url']}\nSnippet: {r['snippet']}\n\n"
-                return {
-                    "text": formatted,
-                    "results": results,
-                    "count": len(results),
-                    "query": query,
-                }
+
+            # Format as text for backward compatibility
+            formatted = "".join(
+                f"Title: {r.get('title', '')}\nLink: {r.get('url', '')}\nSnippet: {r.get('content', '')}\n"
+                + (f"Body: {body}\n" if body is not None else "")
+                + "\n"
+                for r, body in zip(raw_results, bodies)
+            )
+            return {"text": formatted, "count": len(raw_results), "query": query}
 
         except Exception as e:
             return {"error": str(e), "results": []}
 
+    @classmethod
+    def _get_client(cls, client_cls, api_key):
+        with cls._CLIENT_LOCK:
+            client = cls._CLIENT_CACHE.get(api_key)
+            if client is None:
+                client = cls._CLIENT_CACHE[api_key] = client_cls(api_key=api_key)
+        return client
+
+    @classmethod
+    def _cached_search(cls, key):
+        with cls._SEARCH_CACHE_LOCK:
+            entry = cls._SEARCH_CACHE.get(key)
+            if entry is None:
+                return None
+            if entry[0] <= time.monotonic():
+                del cls._SEARCH_CACHE[key]
+                return None
+            cls._SEARCH_CACHE.move_to_end(key)
+            return entry[1]
+
+    @classmethod
+    def _store_search(cls, key, response):
+        with cls._SEARCH_CACHE_LOCK:
+            cls._SEARCH_CACHE[key] = (time.monotonic() + cls.SEARCH_CACHE_TTL, response)
+            cls._SEARCH_CACHE.move_to_end(key)
+            while len(cls._SEARCH_CACHE) > cls.SEARCH_CACHE_SIZE:
+                cls._SEARCH_CACHE.popitem(last=False)
+
+    def _fetch_bodies(self, urls, concurrency):
+        """Fetch every result page concurrently; returns their texts in order."""
+
+        def fetch_text(url):
+            try:
+                return WebFetchNode.fetch(url, self.INLINE_FETCH_CHARS)["text"]
+            except Exception as e:
+                logger.warning("WebSearchNode: failed to fetch %s: %s", url, e)
+                return ""
+
+        workers = max(1, min(concurrency, len(urls)))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            return list(pool.map(fetch_text, urls))
+
     def post(self, shared, prep_res, exec_res):
         if prep_res["as_list"]:
             super().post(shared, prep_res, exec_res.get("results", []))
@@ -170,18 +347,41 @@ class WebFetchNode(BasePlatformNode, Node):
             "default": False,
             "description": "Also extract links from the page",
         },
+        "concurrent": {
+            "type": "boolean",
+            "default": False,
+            "description": "Fetch alongside sibling web fetch branches (which then can't see each other's output)",
+        },
     }
 
-    DEFAULT_USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
+    DEFAULT_USER_AGENT = DEFAULT_USER_AGENT
+
+    # Fetches in flight at once in aexec_many
+    MAX_CONCURRENCY = 8
+
+    # (url, max_chars, extract_links) -> (etag, modified, result) for pages
+    # that sent validators, so unchanged pages are answered from a 304
+    # without downloading or re-parsing them
+    _PAGE_CACHE = OrderedDict()
+    _PAGE_CACHE_LOCK = threading.Lock()
+    PAGE_CACHE_SIZE = 128
+
+    # Read at most this many bytes per requested character (markup is much
+    # bigger than the text left after extraction), or MAX_BYTES if unlimited.
+    # MIN_BYTES leaves room for the <head> and inline scripts that come
+    # before any text on heavy pages.
+    BYTES_PER_CHAR = 8
+    MIN_BYTES = 1_000_000
+    MAX_BYTES = 10_000_000
 
     def prep(self, shared):
         cfg = getattr(self, "config", {})
 
         # Build context
         context = {}
-        results = shared.get("results", {})
+        results = shared.get("results")
         if results:
-            last_key = list(results.keys())[-1]
+            last_key = next(reversed(results))
             context["input"] = results[last_key]
 
         if "memory" in shared:
@@ -195,57 +395,285 @@ class WebFetchNode(BasePlatformNode, Node):
         }
 
     def exec(self, prep_res):
-        url = prep_res["url"]
+        url = self._resolve_url(prep_res)
+        if not url:
+            return {"error": "No URL provided", "text": ""}
+
+        try:
+            return self.fetch(url, prep_res["max_chars"], prep_res["extract_links"])
+        except Exception as e:
+            return {"error": str(e), "text": "", "url": url}
+
+    async def aexec(self, prep_res, client):
+        """Async exec() against an httpx.AsyncClient (see aexec_many)."""
+        url = self._resolve_url(prep_res)
+        if not url:
+            return {"error": "No URL provided", "text": ""}
+
         max_chars = prep_res["max_chars"]
         extract_links = prep_res["extract_links"]
+        key = (url, max_chars, extract_links)
+        try:
+            cached = self._cached_page(key)
+            response = await self._aread_capped(
+                client, url, self._max_bytes(max_chars), cached
+            )
+            if response is None:
+                return self._copy_page(cached[2])
+            body, encoding, etag, modified = response
+            # Parsing is CPU-bound; keep it off the event loop
+            result = await asyncio.to_thread(
+                self._page_result, url, body, encoding, max_chars, extract_links
+            )
+            self._store_page(key, etag, modified, result)
+            return self._copy_page(result)
+        except Exception as e:
+            return {"error": str(e), "text": "", "url": url}
+
+    @classmethod
+    async def aexec_many(cls, nodes: list, preps: list, max_concurrency: int = None) -> list:
+        """
+        Fetch for several prepared nodes concurrently over one async client,
+        at most `max_concurrency` at a time. Returns exec() results aligned
+        with `nodes`.
+        """
+        semaphore = asyncio.Semaphore(max_concurrency or cls.MAX_CONCURRENCY)
+        # Async pools are tied to the running event loop, so the client lives
+        # only as long as this call.
+        async with httpx.AsyncClient(
+            headers={"User-Agent": DEFAULT_USER_AGENT},
+            timeout=httpx.Timeout(HTTP_TIMEOUT[1], connect=HTTP_TIMEOUT[0]),
+            limits=httpx.Limits(max_connections=64, max_keepalive_connections=32),
+            follow_redirects=True,
+        ) as client:
+
+            async def guarded(node, prep_res):
+                async with semaphore:
+                    return await node.aexec(prep_res, client)
+
+            return await asyncio.gather(
+                *(guarded(node, prep_res) for node, prep_res in zip(nodes, preps))
+            )
+
+    @staticmethod
+    def _resolve_url(prep_res):
         context = prep_res["context"]
 
         # Variable substitution
-        for key, value in context.items():
-            url = url.replace(f"{{{key}}}", str(value))
+        url = _substitute(prep_res["url"], context)
 
         # Use input as URL if param is empty
         if not url and "input" in context:
             input_val = str(context["input"])
             if input_val.startswith("http"):
                 url = input_val
-
-        if not url:
-            return {"error": "No URL provided", "text": ""}
-
+        return url
+
+    @classmethod
+    def _max_bytes(cls, max_chars):
+        if max_chars <= 0:
+            return cls.MAX_BYTES
+        return min(max(max_chars * cls.BYTES_PER_CHAR, cls.MIN_BYTES), cls.MAX_BYTES)
+
+    @classmethod
+    def fetch(cls, url, max_chars=10000, extract_links=False):
+        """Download url and extract its readable text (raises on failure)."""
+        key = (url, max_chars, extract_links)
+        cached = cls._cached_page(key)
+        response = cls._read_capped(url, cls._max_bytes(max_chars), cached)
+        if response is None:
+            return cls._copy_page(cached[2])
+        body, encoding, etag, modified = response
+        result = cls._page_result(url, body, encoding, max_chars, extract_links)
+        cls._store_page(key, etag, modified, result)
+        return cls._copy_page(result)
+
+    @classmethod
+    def _cached_page(cls, key):
+        with cls._PAGE_CACHE_LOCK:
+            cached = cls._PAGE_CACHE.get(key)
+            if cached is not None:
+                cls._PAGE_CACHE.move_to_end(key)
+            return cached
+
+    @classmethod
+    def _store_page(cls, key, etag, modified, result):
+        with cls._PAGE_CACHE_LOCK:
+            if not (etag or modified):
+                cls._PAGE_CACHE.pop(key, None)
+                return
+            cls._PAGE_CACHE[key] = (etag, modified, result)
+            cls._PAGE_CACHE.move_to_end(key)
+            while len(cls._PAGE_CACHE) > cls.PAGE_CACHE_SIZE:
+                cls._PAGE_CACHE.popitem(last=False)
+
+    @staticmethod
+    def _copy_page(result):
+        # Cached results are shared; hand out copies callers may modify
+        return dict(result, links=[dict(link) for link in result["links"]])
+
+    @classmethod
+    def _page_result(cls, url, body, encoding, max_chars, extract_links):
+        lexbor = _lexbor_parser()
+        lxml_html = _lxml_html()
+        if lexbor is not None:
+            text, links = cls._extract_lexbor(lexbor, body, encoding, extract_links)
+        elif lxml_html is not None:
+            text, links = cls._extract_lxml(lxml_html, body, encoding, extract_links)
+        else:
+            text, links = cls._extract_bs4(body, encoding, extract_links)
+
+        # Collapse spaces, then trim lines and drop blank ones
+        text = _NL_RE.sub("\n", _WS_RE.sub(" ", text)).strip()
+
+        # Apply limit
+        if max_chars > 0 and len(text) > max_chars:
+            text = text[:max_chars] + "..."
+
+        return {"text": text, "links": links, "url": url, "length": len(text)}
+
+    @staticmethod
+    def _extract_lexbor(parser_cls, body, encoding, extract_links):
+        """Raw page text and links via selectolax's lexbor backend."""
+        html = body
+        if encoding:
+            try:
+                html = body.decode(encoding, errors="replace")
+            except LookupError:
+                pass
+        if isinstance(html, bytes):
+            tree = parser_cls(html, encoding=True)  # sniff <meta charset>
+        else:
+            tree = parser_cls(html)
+
+        links = []
+        if extract_links:
+            seen = set()
+            for a in tree.css("a[href]"):
+                href = a.attributes.get("href")
+                if href and href.startswith("http") and href not in seen:
+                    seen.add(href)
+                    links.append({"text": a.text(strip=True), "url": href})
+
+        # Remove scripts and styles
+        tree.strip_tags(_DROPPED_TAGS)
+        root = tree.body or tree.root
+        return (root.text(deep=True, separator="", strip=False) if root else ""), links
+
+    @staticmethod
+    def _extract_lxml(lxml_html, body, encoding, extract_links):
+        """Raw page text and links straight from an lxml tree, skipping the
+        BeautifulSoup layer on top of it."""
+        parser = None
+        if encoding:
+            try:
+                parser = lxml_html.HTMLParser(encoding=encoding)
+            except LookupError:
+                pass
         try:
-            headers = {"User-Agent": self.DEFAULT_USER_AGENT}
-            resp = requests.get(url, timeout=15, headers=headers)
+            doc = lxml_html.document_fromstring(body, parser=parser)
+        except _lxml_etree().ParserError:
+            return "", []  # empty document
+        root = doc.find("body")
+        if root is None:
+            root = doc
+
+        links = []
+        if extract_links:
+            seen = set()
+            for a in root.iter("a"):
+                href = a.get("href")
+                if href and href.startswith("http") and href not in seen:
+                    seen.add(href)
+                    links.append({"text": a.text_content().strip(), "url": href})
+
+        # Remove scripts and styles; drop_tree keeps the text that follows them
+        for el in list(root.iter(*_DROPPED_TAGS)):
+            el.drop_tree()
+
+        return root.text_content(), links
+
+    @staticmethod
+    def _extract_bs4(body, encoding, extract_links):
+        """Raw page text and links via BeautifulSoup."""
+        from bs4 import BeautifulSoup, SoupStrainer
+
+        # Only the body is used, so skip building a tree for <head>
+        parser = _html_parser()
+        soup = BeautifulSoup(
+            body, parser, parse_only=SoupStrainer("body"), from_encoding=encoding
+        )
+        if not soup.contents:
+            # Fragment without a <body> tag
+            soup = BeautifulSoup(body, parser, from_encoding=encoding)
+
+        # One traversal collects links (if requested) and the elements to
+        # drop; removal waits until the end so links inside nav still count
+        links = []
+        seen = set()
+        removed = []
+        names = _DROPPED_TAGS + ["a"] if extract_links else _DROPPED_TAGS
+        for el in soup.find_all(names):
+            if el.name != "a":
+                removed.append(el)
+                continue
+            href = el.get("href")
+            if href and href.startswith("http") and href not in seen:
+                seen.add(href)
+                links.append({"text": el.get_text(strip=True), "url": href})
+
+        # Remove scripts and styles
+        for el in removed:
+            if not el.decomposed:
+                el.decompose()
+
+        return soup.get_text(), links
+
+    @staticmethod
+    def _read_capped(url, max_bytes, cached=None):
+        """Stream the response body, stopping once max_bytes have arrived.
+
+        Returns (body bytes, declared charset or None, ETag, Last-Modified),
+        or None if the server answers 304 to revalidating `cached`.
+        """
+        headers = _conditional_headers(*cached[:2]) if cached else None
+        # The default Accept-Encoding already lists every content coding
+        # urllib3 can decode (br/zstd too when their packages are installed)
+        with _SESSION.get(url, timeout=HTTP_TIMEOUT, headers=headers, stream=True) as resp:
+            if cached and resp.status_code == 304:
+                return None
             resp.raise_for_status()
-
-            soup = BeautifulSoup(resp.text, "html.parser")
-
-            # Extract links if requested
-            links = []
-            if extract_links:
-                for a in soup.find_all("a", href=True):
-                    href = a["href"]
-                    if href.startswith("http"):
-                        links.append({"text": a.get_text(strip=True), "url": href})
-
-            # Remove scripts and styles
-            for script in soup(["script", "style", "nav", "footer", "header"]):
-                script.decompose()
-
-            text = soup.get_text()
-            # Clean lines
-            lines = (line.strip() for line in text.splitlines())
-            chunks = (phrase.strip() for line in lines for phrase in line.split("  "))
-            text = "\n".join(chunk for chunk in chunks if chunk)
-
-            # Apply limit
-            if max_chars > 0 and len(text) > max_chars:
-                text = text[:max_chars] + "..."
-
-            return {"text": text, "links": links, "url": url, "length": len(text)}
-
-        except Exception as e:
-            return {"error": str(e), "text": "", "url": url}
+            buf = bytearray()
+            for chunk in resp.iter_content(chunk_size=65536):
+                buf += chunk
+                if len(buf) >= max_bytes:
+                    del buf[max_bytes:]
+                    break
+            # requests assumes ISO-8859-1 for text/* without a charset; only
+            # trust an explicit one and let BeautifulSoup sniff the rest.
+            content_type = resp.headers.get("Content-Type", "").lower()
+            encoding = resp.encoding if "charset" in content_type else None
+            etag, modified = resp.headers.get("ETag"), resp.headers.get("Last-Modified")
+        return bytes(buf), encoding, etag, modified
+
+    @staticmethod
+    async def _aread_capped(client, url, max_bytes, cached=None):
+        """Async _read_capped() over an httpx.AsyncClient."""
+        headers = _conditional_headers(*cached[:2]) if cached else None
+        async with client.stream("GET", url, headers=headers) as resp:
+            if cached and resp.status_code == 304:
+                return None
+            resp.raise_for_status()
+            buf = bytearray()
+            async for chunk in resp.aiter_bytes():
+                buf += chunk
+                if len(buf) >= max_bytes:
+                    del buf[max_bytes:]
+                    break
+            # Only an explicit charset, as in _read_capped
+            encoding = resp.charset_encoding
+            etag, modified = resp.headers.get("ETag"), resp.headers.get("Last-Modified")
+        return bytes(buf), encoding, etag, modified
 
     def post(self, shared, prep_res, exec_res):
         if exec_res.get("error"):
@@ -255,7 +683,125 @@ class WebFetchNode(BasePlatformNode, Node):
         return None
 
 
-import feedparser
+# Feed parsers return (etag, modified, title, link, entries, complete), where
+# complete is False if parsing stopped after max_entries, or None on a 304.
+_UNPARSED = object()
+
+
+def _parse_rss_feedparser(url, etag=None, modified=None):
+    import feedparser
+
+    if not url.startswith(("http://", "https://")):
+        # Local paths and inline XML are handled by feedparser itself
+        feed = feedparser.parse(url)
+        etag = modified = None
+    else:
+        # Download through the pooled session; feedparser only parses
+        resp = _SESSION.get(
+            url, timeout=HTTP_TIMEOUT, headers=_conditional_headers(etag, modified)
+        )
+        if resp.status_code == 304 and (etag or modified):
+            return None
+        resp.raise_for_status()
+        feed = feedparser.parse(
+            resp.content,
+            response_headers={k.lower(): v for k, v in resp.headers.items()},
+        )
+        etag = resp.headers.get("ETag")
+        modified = resp.headers.get("Last-Modified")
+
+    if feed.bozo and not feed.entries:
+        raise ValueError(f"Error parsing feed: {feed.bozo_exception}")
+
+    entries = [
+        {
+            "title": entry.get("title", "No Title"),
+            "link": entry.get("link", ""),
+            "summary": entry.get("summary", ""),
+            "published": entry.get("published", ""),
+        }
+        for entry in feed.entries
+    ]
+    return (
+        etag,
+        modified,
+        feed.feed.get("title", "Unknown"),
+        feed.feed.get("link", ""),
+        entries,
+        True,
+    )
+
+
+def _local_name(elem):
+    tag = elem.tag
+    return tag.rsplit("}", 1)[-1] if isinstance(tag, str) else ""
+
+
+def _child_text(elem, *names):
+    for child in elem:
+        if _local_name(child) in names and child.text:
+            return child.text.strip()
+    return ""
+
+
+def _atom_link(elem):
+    for child in elem:
+        if _local_name(child) == "link" and child.get("rel", "alternate") == "alternate":
+            return child.get("href", "")
+    return ""
+
+
+def _parse_rss_fast(url, max_entries, etag=None, modified=None):
+    """Stream an RSS/Atom feed through lxml's iterparse, keeping only the first
+    max_entries items and freeing each element as soon as it is read."""
+    with _SESSION.get(
+        url, timeout=HTTP_TIMEOUT, headers=_conditional_headers(etag, modified), stream=True
+    ) as resp:
+        if resp.status_code == 304 and (etag or modified):
+            return None
+        resp.raise_for_status()
+        resp.raw.decode_content = True
+
+        title = link = None
+        entries = []
+        complete = True
+        iterparse = _lxml_etree().iterparse
+        for _, elem in iterparse(resp.raw, events=("end",), recover=True):
+            name = _local_name(elem)
+            if name in ("item", "entry"):
+                entries.append(
+                    {
+                        "title": _child_text(elem, "title") or "No Title",
+                        "link": _child_text(elem, "link") or _atom_link(elem),
+                        "summary": _child_text(elem, "description", "summary", "content"),
+                        "published": _child_text(elem, "pubDate", "published"),
+                    }
+                )
+                elem.clear()
+                parent = elem.getparent()
+                while parent is not None and elem.getprevious() is not None:
+                    del parent[0]
+                if len(entries) >= max_entries:
+                    complete = False
+                    break
+            elif name in ("title", "link") and _local_name(elem.getparent()) in ("channel", "feed"):
+                if name == "title" and title is None:
+                    title = (elem.text or "").strip()
+                # Skip rel="self" and other non-alternate links, as _atom_link does
+                elif name == "link" and link is None and elem.get("rel", "alternate") == "alternate":
+                    link = (elem.text or "").strip() or elem.get("href", "")
+
+        if not entries and title is None:
+            raise ValueError("No RSS or Atom content found")
+
+        return (
+            resp.headers.get("ETag"),
+            resp.headers.get("Last-Modified"),
+            title or "Unknown",
+            link or "",
+            entries,
+            complete,
+        )
 
 
 class RSSNode(BasePlatformNode, Node):
@@ -266,12 +812,12 @@ class RSSNode(BasePlatformNode, Node):
     PARAMS = {
         "url": {
             "type": "string",
-            "description": "RSS feed URL (supports {input}, {memory_key})",
+            "description": "RSS feed URL (supports {input}, {memory_key}); separate several URLs with spaces or newlines to fetch them in parallel",
         },
         "max_entries": {
             "type": "int",
             "default": 10,
-            "description": "Maximum number of entries to return",
+            "description": "Maximum number of entries to return (per feed)",
         },
         "as_list": {
             "type": "boolean",
@@ -280,14 +826,23 @@ class RSSNode(BasePlatformNode, Node):
         },
     }
 
+    # url -> last parse result (see _parse_rss_feedparser), so unchanged feeds
+    # are answered from a 304 without downloading or re-parsing
+    _FEED_CACHE = OrderedDict()
+    _FEED_CACHE_LOCK = threading.Lock()
+    FEED_CACHE_SIZE = 128
+
+    # Feeds fetched at once when several URLs are given
+    MAX_FEED_WORKERS = 10
+
     def prep(self, shared):
         cfg = getattr(self, "config", {})
 
         # Build context
         context = {}
-        results = shared.get("results", {})
+        results = shared.get("results")
         if results:
-            last_key = list(results.keys())[-1]
+            last_key = next(reversed(results))
             context["input"] = results[last_key]
 
         if "memory" in shared:
@@ -307,56 +862,140 @@ class RSSNode(BasePlatformNode, Node):
         context = prep_res["context"]
 
         # Variable substitution
-        for key, value in context.items():
-            url = url.replace(f"{{{key}}}", str(value))
+        url = _substitute(url, context)
 
-        # Use input as URL if param is empty
-        if not url and "input" in context:
-            input_val = str(context["input"])
-            if input_val.startswith("http"):
-                url = input_val
+        urls = url.split()
 
-        if not url:
+        # Use input as URL(s) if param is empty
+        if not urls and "input" in context:
+            input_val = context["input"]
+            if isinstance(input_val, list):
+                urls = [u for u in input_val if isinstance(u, str) and u.startswith("http")]
+            elif str(input_val).startswith("http"):
+                urls = str(input_val).split()
+
+        if not urls:
             return {"error": "No RSS URL provided", "entries": []}
 
+        if len(urls) > 1:
+            return self._exec_many(urls, max_entries, as_list)
+
         try:
-            feed = feedparser.parse(url)
-            if feed.bozo and not feed.entries:
+            title, link, all_entries = self._load_feed(urls[0], max_entries)
+            entries = all_entries[:max_entries]
+
+            if not as_list:
+                # Format as text for backward compatibility; the cached
+                # entries are only read, so no copies are needed
                 return {
-                    "error": f"Error parsing feed: {feed.bozo_exception}",
-                    "entries": [],
+                    "title": title,
+                    "link": link,
+                    "text": self._format_feed(title, entries),
+                    "count": len(entries),
                 }
 
-            entries = []
-            for entry in feed.entries[:max_entries]:
-                entries.append(
-                    {
-                        "title": entry.get("title", "No Title"),
-                        "link": entry.get("link", ""),
-                        "summary": entry.get("summary", ""),
-                        "published": entry.get("published", ""),
-                    }
-                )
-
-            feed_info = {
-                "title": feed.feed.get("title", "Unknown"),
-                "link": feed.feed.get("link", ""),
+            entries = [dict(e) for e in entries]
+            return {
+                "title": title,
+                "link": link,
                 "entries": entries,
                 "count": len(entries),
             }
 
-            if not as_list:
-                # Format as text for backward compatibility
-                formatted = f"Feed: {feed_info['title']}\n\n"
-                for e in entries:
-                    formatted += f"Title: {e['title']}\nLink: {e['link']}\nSummary: {e['summary']}\n---\n"
-                feed_info["text"] = formatted
-
-            return feed_info
-
         except Exception as e:
             return {"error": str(e), "entries": []}
 
+    def _exec_many(self, urls, max_entries, as_list):
+        """Fetch and parse several feeds on a thread pool; entries are merged
+        in URL order and tagged with their feed's title."""
+
+        def load(url):
+            try:
+                return self._load_feed(url, max_entries), None
+            except Exception as e:
+                return None, str(e)
+
+        workers = min(self.MAX_FEED_WORKERS, len(urls))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            loaded = list(pool.map(load, urls))
+
+        feeds, entries, errors, parts = [], [], [], []
+        count = 0
+        for url, (feed, error) in zip(urls, loaded):
+            if feed is None:
+                feeds.append({"url": url, "error": error})
+                errors.append(f"{url}: {error}")
+                continue
+            title, link, all_entries = feed
+            feed_entries = all_entries[:max_entries]
+            feeds.append({"url": url, "title": title, "link": link, "count": len(feed_entries)})
+            count += len(feed_entries)
+            if as_list:
+                entries.extend(dict(e, feed=title) for e in feed_entries)
+            else:
+                parts.append(self._format_feed(title, feed_entries))
+
+        if len(errors) == len(urls):
+            return {"error": "; ".join(errors), "entries": []}
+
+        feed_info = {
+            "title": ", ".join(f["title"] for f in feeds if "title" in f),
+            "link": "",
+            "feeds": feeds,
+            "count": count,
+        }
+        if as_list:
+            feed_info["entries"] = entries
+        else:
+            feed_info["text"] = "\n".join(parts)
+        return feed_info
+
+    @staticmethod
+    def _format_feed(title, entries):
+        parts = [f"Feed: {title}\n\n"]
+        parts.extend(
+            f"Title: {e['title']}\nLink: {e['link']}\nSummary: {e['summary']}\n---\n"
+            for e in entries
+        )
+        return "".join(parts)
+
+    @classmethod
+    def _load_feed(cls, url, max_entries):
+        """Return (title, link, entries), revalidating cached feeds with a
+        conditional GET (ETag / Last-Modified)."""
+        with cls._FEED_CACHE_LOCK:
+            cached = cls._FEED_CACHE.get(url)
+        if cached and not cached[5] and len(cached[4]) < max_entries:
+            cached = None  # The fast parser stopped short of what we need now
+        etag, modified = cached[:2] if cached else (None, None)
+
+        parsed = _UNPARSED
+        if _lxml_etree() is not None:
+            try:
+                parsed = _parse_rss_fast(url, max_entries, etag, modified)
+            except Exception as e:
+                logger.warning("RSSNode: fast parse failed for %s, using feedparser: %s", url, e)
+        if parsed is _UNPARSED:
+            parsed = _parse_rss_feedparser(url, etag, modified)
+
+        if parsed is None:
+            # 304 Not Modified
+            with cls._FEED_CACHE_LOCK:
+                if url in cls._FEED_CACHE:
+                    cls._FEED_CACHE.move_to_end(url)
+            return cached[2:5]
+
+        etag, modified = parsed[:2]
+        with cls._FEED_CACHE_LOCK:
+            if etag or modified:
+                cls._FEED_CACHE[url] = parsed
+                cls._FEED_CACHE.move_to_end(url)
+                while len(cls._FEED_CACHE) > cls.FEED_CACHE_SIZE:
+                    cls._FEED_CACHE.popitem(last=False)
+            else:
+                cls._FEED_CACHE.pop(url, None)
+        return parsed[2:5]
+
     def post(self, shared, prep_res, exec_res):
         if prep_res["as_list"]:
             super().post(shared, prep_res, exec_res.get("entries", []))
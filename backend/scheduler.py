@@ -1,10 +1,10 @@
 import os
-import json
 import logging
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.triggers.cron import CronTrigger
 from apscheduler.triggers.interval import IntervalTrigger
 from .engine import run_workflow
+from .nodes import _json
 
 logger = logging.getLogger(__name__)
 
@@ -13,6 +13,9 @@ class SchedulerService:
         self.scheduler = AsyncIOScheduler()
         self.workflows_dir = workflows_dir
         self.jobs = {}
+        # filename -> (mtime_ns, size) as of the last load, for workflows_dir
+        self._stamps = {}
+        self._stamps_dir = None
 
     def start(self):
         self.scheduler.start()
@@ -24,24 +27,51 @@ class SchedulerService:
         logger.info("Scheduler stopped")
 
     def refresh_jobs(self):
-        """Scans all workflows and schedules them if they have a CronNode"""
+        """
+        Scans all workflows and schedules them if they have a CronNode.
+
+        Only files added, changed (by mtime/size) or removed since the last
+        refresh are reloaded; jobs for unchanged files are left as they are.
+        """
         logger.info("Refreshing scheduled jobs...")
-        self.scheduler.remove_all_jobs()
-        
-        if not os.path.exists(self.workflows_dir):
-            return
+        if self.workflows_dir != self._stamps_dir:
+            # Different workspace: start from scratch
+            self.scheduler.remove_all_jobs()
+            self._stamps = {}
+            self._stamps_dir = self.workflows_dir
 
-        for filename in os.listdir(self.workflows_dir):
-            if filename.endswith(".json"):
+        seen = set()
+        if os.path.exists(self.workflows_dir):
+            for entry in os.scandir(self.workflows_dir):
+                filename = entry.name
+                if not filename.endswith(".json"):
+                    continue
+                seen.add(filename)
                 try:
-                    filepath = os.path.join(self.workflows_dir, filename)
-                    with open(filepath, "r") as f:
-                        workflow = json.load(f)
-                    
+                    st = entry.stat()
+                    stamp = (st.st_mtime_ns, st.st_size)
+                    if self._stamps.get(filename) == stamp:
+                        continue
+                    self._stamps[filename] = stamp
+                    self._unschedule(filename)
+
+                    with open(entry.path, "rb") as f:
+                        workflow = _json.loads(f.read())
+
                     self._schedule_workflow(filename, workflow)
                 except Exception as e:
                     logger.error(f"Failed to load workflow {filename}: {e}")
 
+        for filename in set(self._stamps) - seen:
+            # Deleted since the last refresh
+            del self._stamps[filename]
+            self._unschedule(filename)
+
+    def _unschedule(self, filename: str):
+        name = filename.replace(".json", "")
+        if self.scheduler.get_job(name) is not None:
+            self.scheduler.remove_job(name)
+
     def _schedule_workflow(self, filename: str, workflow: dict):
         nodes = workflow.get("nodes", [])
         cron_node = next((n for n in nodes if n.get("type") == "cron"), None)
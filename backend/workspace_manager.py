@@ -5,11 +5,13 @@ import logging
 logger = logging.getLogger(__name__)
 
 class WorkspaceManager:
-    def __init__(self, root_dir: str):
+    def __init__(self, root_dir: str, workspaces_dir: str = None):
         self.root_dir = root_dir
-        self.workspaces_dir = os.path.join(root_dir, "workspaces")
+        self.workspaces_dir = workspaces_dir or os.path.join(root_dir, "workspaces")
         self.default_workspace = "default"
         self.current_workspace = self.default_workspace
+        # (workspaces_dir mtime_ns, names); a single stat revalidates it
+        self._ws_cache = None
         self._ensure_structure()
 
     def _ensure_structure(self):
@@ -33,14 +35,21 @@ class WorkspaceManager:
             os.makedirs(path)
             os.makedirs(os.path.join(path, "workflows"))
             os.makedirs(os.path.join(path, "data"))
+            self._ws_cache = None
             logger.info(f"Created workspace: {name}")
         return path
 
     def list_workspaces(self):
-        if not os.path.exists(self.workspaces_dir):
+        try:
+            mtime = os.stat(self.workspaces_dir).st_mtime_ns
+        except FileNotFoundError:
+            self._ws_cache = None
             return []
-        return [d for d in os.listdir(self.workspaces_dir) 
-                if os.path.isdir(os.path.join(self.workspaces_dir, d))]
+        if self._ws_cache is None or self._ws_cache[0] != mtime:
+            with os.scandir(self.workspaces_dir) as entries:
+                names = [e.name for e in entries if e.is_dir()]
+            self._ws_cache = (mtime, names)
+        return list(self._ws_cache[1])
 
     def set_current_workspace(self, name: str):
         if not os.path.exists(self.get_workspace_dir(name)):
@@ -84,4 +93,5 @@ class WorkspaceManager:
             raise ValueError(f"Workspace {name} does not exist")
         
         shutil.rmtree(path)
+        self._ws_cache = None
         logger.info(f"Deleted workspace: {name}")
@@ -5,6 +5,7 @@ ROOT_DIR = Path(__file__).resolve().parent
 
 # Define paths for commonly used files
 MEMORY_FILE = ROOT_DIR / ".pocketflow_memory.json"
+HISTORY_DIR = ROOT_DIR / ".pocketflow_history"  # LLM chat history, one file per conversation
 
 # App Defaults - LLM Configuration
 LLM_BASE_URL = "http://localhost:1234/v1"
@@ -3,7 +3,7 @@ import React, { useState, useEffect, useCallback } from 'react';
 // Types
 export interface ExecutionEvent {
     id: string;
-    type: 'workflow_start' | 'node_start' | 'node_end' | 'node_error' | 'llm_call' | 'llm_response' | 'user_input_required' | 'user_input_received' | 'workflow_end' | 'workflow_error' | 'state_update';
+    type: 'workflow_start' | 'node_start' | 'node_end' | 'node_error' | 'llm_call' | 'llm_token' | 'llm_response' | 'user_input_required' | 'user_input_received' | 'workflow_end' | 'workflow_error' | 'state_update';
     timestamp: Date;
     nodeId?: string;
     nodeName?: string;
@@ -344,46 +344,59 @@ export const ExecutionView: React.FC<ExecutionViewProps> = ({ onSwitchToEditor,
     // WebSocket connection
     useEffect(() => {
         const ws = new WebSocket('ws://localhost:8000/api/ws');
+        // Events arrive as UTF-8 JSON in binary frames
+        ws.binaryType = 'arraybuffer';
+        const decoder = new TextDecoder();
 
         ws.onopen = () => {
             console.log("ExecutionView: Connected to WebSocket");
         };
 
-        ws.onmessage = (event) => {
-            try {
-                const msg = JSON.parse(event.data);
-                console.log("ExecutionView received:", msg.type, msg.payload);
-
-                // Handle workflow_start first - clear previous events
-                if (msg.type === 'workflow_start') {
-                    setIsRunning(true);
-                    setEvents([]); // Clear previous events before adding new ones
-                    setSharedMemory({});
-                    setResults({});
-                }
+        const handleMessage = (msg: any) => {
+            console.log("ExecutionView received:", msg.type, msg.payload);
+
+            // Handle workflow_start first - clear previous events
+            if (msg.type === 'workflow_start') {
+                setIsRunning(true);
+                setEvents([]); // Clear previous events before adding new ones
+                setSharedMemory({});
+                setResults({});
+            }
 
-                const newEvent: ExecutionEvent = {
-                    id: `evt_${Date.now()}_${Math.random().toString(36).substr(2, 9)}`,
-                    type: msg.type,
-                    timestamp: new Date(),
-                    nodeId: msg.payload?.node_id,
-                    nodeName: msg.payload?.node_name || msg.payload?.node_id,
-                    payload: msg.payload,
-                };
-
-                setEvents(prev => [...prev, newEvent]);
-
-                // Handle other specific event types
-                if (msg.type === 'workflow_end' || msg.type === 'workflow_error') {
-                    setIsRunning(false);
-                    // Update state from final results if available
-                    if (msg.payload?.results) {
-                        setResults(msg.payload.results);
-                    }
-                } else if (msg.type === 'state_update') {
-                    if (msg.payload?.memory) setSharedMemory(msg.payload.memory);
-                    if (msg.payload?.results) setResults(msg.payload.results);
+            // Streamed token deltas are summed up by the llm_response event
+            if (msg.type === 'llm_token') return;
+
+            const newEvent: ExecutionEvent = {
+                id: `evt_${Date.now()}_${Math.random().toString(36).substr(2, 9)}`,
+                type: msg.type,
+                timestamp: new Date(),
+                nodeId: msg.payload?.node_id,
+                nodeName: msg.payload?.node_name || msg.payload?.node_id,
+                payload: msg.payload,
+            };
+
+            setEvents(prev => [...prev, newEvent]);
+
+            // Handle other specific event types
+            if (msg.type === 'workflow_end' || msg.type === 'workflow_error') {
+                setIsRunning(false);
+                // Update state from final results if available
+                if (msg.payload?.results) {
+                    setResults(msg.payload.results);
                 }
+            } else if (msg.type === 'state_update') {
+                if (msg.payload?.memory) setSharedMemory(msg.payload.memory);
+                if (msg.payload?.results) setResults(msg.payload.results);
+            }
+        };
+
+        ws.onmessage = (event) => {
+            try {
+                const data = typeof event.data === 'string' ? event.data : decoder.decode(event.data);
+                const msg = JSON.parse(data);
+                // Events raised close together arrive as one "batch" frame
+                const msgs = msg.type === 'batch' ? msg.events : [msg];
+                msgs.forEach(handleMessage);
             } catch (e) {
                 console.error("ExecutionView WS Error", e);
             }
@@ -121,32 +121,42 @@ const GraphEditorContent: React.FC<GraphEditorProps> = ({ availableNodes, onSwit
     // WebSocket Connection
     useEffect(() => {
         const ws = new WebSocket('ws://localhost:8000/api/ws');
+        // Events arrive as UTF-8 JSON in binary frames
+        ws.binaryType = 'arraybuffer';
+        const decoder = new TextDecoder();
 
         ws.onopen = () => {
             console.log("Connected to WebSocket");
         };
 
+        const handleMessage = (msg: any) => {
+            if (msg.type === 'node_start') {
+                setExecutingNodes(prev => new Set(prev).add(msg.payload.node_id));
+            } else if (msg.type === 'node_end' || msg.type === 'node_error') {
+                setExecutingNodes(prev => {
+                    const next = new Set(prev);
+                    next.delete(msg.payload.node_id);
+                    return next;
+                });
+            } else if (msg.type === 'workflow_end') {
+                // Clear all
+                setExecutingNodes(new Set());
+                // alert("Workflow Execution Completed!"); // Removed annoying alert
+            } else if (msg.type === 'workflow_error') {
+                setExecutingNodes(new Set());
+                alert("Workflow Error: " + msg.payload);
+            } else if (msg.type === 'USER_INPUT_REQUIRED') {
+                setHumanInputRequest(msg.payload);
+            }
+        };
+
         ws.onmessage = (event) => {
             try {
-                const msg = JSON.parse(event.data);
-                if (msg.type === 'node_start') {
-                    setExecutingNodes(prev => new Set(prev).add(msg.payload.node_id));
-                } else if (msg.type === 'node_end' || msg.type === 'node_error') {
-                    setExecutingNodes(prev => {
-                        const next = new Set(prev);
-                        next.delete(msg.payload.node_id);
-                        return next;
-                    });
-                } else if (msg.type === 'workflow_end') {
-                    // Clear all
-                    setExecutingNodes(new Set());
-                    // alert("Workflow Execution Completed!"); // Removed annoying alert
-                } else if (msg.type === 'workflow_error') {
-                    setExecutingNodes(new Set());
-                    alert("Workflow Error: " + msg.payload);
-                } else if (msg.type === 'USER_INPUT_REQUIRED') {
-                    setHumanInputRequest(msg.payload);
-                }
+                const data = typeof event.data === 'string' ? event.data : decoder.decode(event.data);
+                const msg = JSON.parse(data);
+                // Events raised close together arrive as one "batch" frame
+                const msgs = msg.type === 'batch' ? msg.events : [msg];
+                msgs.forEach(handleMessage);
             } catch (e) {
                 console.error("WS Error", e);
             }
@@ -4,89 +4,87 @@
 Debug script to analyze WebSocket flow without running the full backend
 """
 
+import sys
+
+_REPORT = """\
+=== WebSocket Notification System Debug Analysis ===
+
+1. EVENT FLOW ANALYSIS:
+   Backend Events Generation:
+   - engine.py:build_graph() sets pf_node.on_event = event_callback
+   - base.py:BasePlatformNode.run() calls callback('node_start', ...)
+   - main.py:event_callback() uses asyncio.run_coroutine_threadsafe()
+   - websockets.py:manager.broadcast() sends to all connections
+
+2. POTENTIAL ISSUES IDENTIFIED:
+
+   Issue #1: Duplicate Startup Event Handlers
+   - main.py has two @app.on_event('startup') decorators
+   - Second one may override the first
+   - This could prevent loop_instance from being set
+
+   Issue #2: Threading Problem
+   - engine.py uses asyncio.to_thread(flow.run, shared_state)
+   - base.py calls callback from within the thread
+   - callback tries to schedule on main loop via run_coroutine_threadsafe
+   - If loop_instance is None, events are lost
+
+   Issue #3: Message Format Consistency
+   - Frontend expects: msg.type and msg.payload.node_id
+   - Backend sends: {type: event, payload: payload}
+   - This seems consistent, but verify actual messages
+
+   Issue #4: Node ID Mapping
+   - Frontend nodes have IDs like 'dndnode_0', 'dndnode_1'
+   - Backend uses IDs from workflow JSON
+   - If mismatched, frontend won't find nodes to style
+
+   Issue #5: WebSocket Connection Timing
+   - Frontend connects in useEffect on component mount
+   - If workflow runs before connection established, events lost
+   - No explicit connection verification before workflow run
+
+3. DEBUGGING STEPS:
+
+   Step 1: Add logging to verify loop_instance is set
+   Step 2: Add logging in event_callback to see if it's called
+   Step 3: Add logging in manager.broadcast() to verify sends
+   Step 4: Add browser console logging to verify receives
+   Step 5: Check node ID mapping between frontend and backend
+
+4. QUICK FIXES TO TRY:
+
+   A. Consolidate startup handlers:
+      @app.on_event('startup')
+      async def startup():
+          global loop_instance
+          loop_instance = asyncio.get_running_loop()
+          scheduler.start()
+
+   B. Add safety checks in event_callback:
+      def event_callback(event, payload):
+          if not loop_instance:
+              print('ERROR: loop_instance is None')
+              return
+          # ... rest of callback
+
+   C. Add connection verification in frontend:
+      ws.onopen = () => {
+          console.log('WebSocket connected, ready for events')
+          setWebSocketReady(true)
+      }
+
+   D. Verify node ID mapping:
+      console.log('Current node IDs:', nodes.map(n => n.id))
+      console.log('Event node_id:', msg.payload.node_id)
+
+"""
+
+
 def analyze_websocket_flow():
-    print("=== WebSocket Notification System Debug Analysis ===\n")
-    
-    print("1. EVENT FLOW ANALYSIS:")
-    print("   Backend Events Generation:")
-    print("   - engine.py:build_graph() sets pf_node.on_event = event_callback")
-    print("   - base.py:BasePlatformNode.run() calls callback('node_start', ...)") 
-    print("   - main.py:event_callback() uses asyncio.run_coroutine_threadsafe()")
-    print("   - websockets.py:manager.broadcast() sends to all connections")
-    print()
-    
-    print("2. POTENTIAL ISSUES IDENTIFIED:")
-    print()
-    
-    print("   Issue #1: Duplicate Startup Event Handlers")
-    print("   - main.py has two @app.on_event('startup') decorators")
-    print("   - Second one may override the first")
-    print("   - This could prevent loop_instance from being set")
-    print()
-    
-    print("   Issue #2: Threading Problem")
-    print("   - engine.py uses asyncio.to_thread(flow.run, shared_state)")
-    print("   - base.py calls callback from within the thread")
-    print("   - callback tries to schedule on main loop via run_coroutine_threadsafe")
-    print("   - If loop_instance is None, events are lost")
-    print()
-    
-    print("   Issue #3: Message Format Consistency")
-    print("   - Frontend expects: msg.type and msg.payload.node_id")
-    print("   - Backend sends: {type: event, payload: payload}")
-    print("   - This seems consistent, but verify actual messages")
-    print()
-    
-    print("   Issue #4: Node ID Mapping")
-    print("   - Frontend nodes have IDs like 'dndnode_0', 'dndnode_1'")
-    print("   - Backend uses IDs from workflow JSON")
-    print("   - If mismatched, frontend won't find nodes to style")
-    print()
-    
-    print("   Issue #5: WebSocket Connection Timing")
-    print("   - Frontend connects in useEffect on component mount")
-    print("   - If workflow runs before connection established, events lost")
-    print("   - No explicit connection verification before workflow run")
-    print()
-    
-    print("3. DEBUGGING STEPS:")
-    print()
-    print("   Step 1: Add logging to verify loop_instance is set")
-    print("   Step 2: Add logging in event_callback to see if it's called")
-    print("   Step 3: Add logging in manager.broadcast() to verify sends")
-    print("   Step 4: Add browser console logging to verify receives")
-    print("   Step 5: Check node ID mapping between frontend and backend")
-    print()
-    
-    print("4. QUICK FIXES TO TRY:")
-    print()
-    print("   A. Consolidate startup handlers:")
-    print("      @app.on_event('startup')")
-    print("      async def startup():")
-    print("          global loop_instance")
-    print("          loop_instance = asyncio.get_running_loop()")
-    print("          scheduler.start()")
-    print()
-    
-    print("   B. Add safety checks in event_callback:")
-    print("      def event_callback(event, payload):")
-    print("          if not loop_instance:")
-    print("              print('ERROR: loop_instance is None')")
-    print("              return")
-    print("          # ... rest of callback")
-    print()
-    
-    print("   C. Add connection verification in frontend:")
-    print("      ws.onopen = () => {")
-    print("          console.log('WebSocket connected, ready for events')")
-    print("          setWebSocketReady(true)")
-    print("      }")
-    print()
-    
-    print("   D. Verify node ID mapping:")
-    print("      console.log('Current node IDs:', nodes.map(n => n.id))")
-    print("      console.log('Event node_id:', msg.payload.node_id)")
-    print()
+    # One write instead of a print() per line
+    sys.stdout.write(_REPORT)
+
 
 if __name__ == "__main__":
     analyze_websocket_flow()
@@ -3,51 +3,101 @@ ENHANCED VERSION of backend/websockets.py with better error handling and logging
 Replace the entire websockets.py file with this version
 """
 
+import asyncio
+from collections import deque
 from fastapi import WebSocket
-from typing import List
+from typing import Set, Union
 import logging
 
 logger = logging.getLogger(__name__)
 
 class ConnectionManager:
+    # Seconds one client may take to accept a frame before it is dropped, so
+    # a stalled socket cannot hold up every broadcast behind it
+    SEND_TIMEOUT = 5.0
+    # Clients sent to at once; the loop gets a turn between batches so HTTP
+    # requests are not starved when many dashboards are open
+    BROADCAST_BATCH_SIZE = 50
+
     def __init__(self):
-        self.active_connections: List[WebSocket] = []
+        self.active_connections: Set[WebSocket] = set()
+        # Serialized events waiting for dispatch_events(); whatever piles up
+        # while a broadcast is in flight goes out as one "batch" frame
+        self._pending = deque()
+        self._pending_ready = asyncio.Event()
         logger.info("ConnectionManager initialized")
 
     async def connect(self, websocket: WebSocket):
         await websocket.accept()
-        self.active_connections.append(websocket)
-        logger.info(f"WebSocket connected. Total connections: {len(self.active_connections)}")
+        self.active_connections.add(websocket)
+        logger.info("WebSocket connected. Total connections: %d", len(self.active_connections))
 
     def disconnect(self, websocket: WebSocket):
         if websocket in self.active_connections:
             self.active_connections.remove(websocket)
-            logger.info(f"WebSocket disconnected. Total connections: {len(self.active_connections)}")
+            logger.info("WebSocket disconnected. Total connections: %d", len(self.active_connections))
         else:
             logger.warning("Attempted to disconnect WebSocket that wasn't in active connections")
 
-    async def broadcast(self, message: str):
-        logger.info(f"Broadcasting message to {len(self.active_connections)} connections: {message}")
+    async def broadcast(self, message: Union[str, bytes]):
+        """Send message to every connection; bytes go out as binary frames,
+        which skips re-encoding the text once per client."""
+        logger.debug("Broadcasting message to %d connections: %s", len(self.active_connections), message)
         
+        connections = list(self.active_connections)
+        send = "send_bytes" if isinstance(message, bytes) else "send_text"
+        results = []
+        for start in range(0, len(connections), self.BROADCAST_BATCH_SIZE):
+            if start:
+                await asyncio.sleep(0)
+            results += await asyncio.gather(
+                *(
+                    asyncio.wait_for(getattr(connection, send)(message), self.SEND_TIMEOUT)
+                    for connection in connections[start:start + self.BROADCAST_BATCH_SIZE]
+                ),
+                return_exceptions=True,
+            )
+
         dead_connections = []
         successful_sends = 0
-        
-        for i, connection in enumerate(self.active_connections):
-            try:
-                await connection.send_text(message)
-                successful_sends += 1
-                logger.debug(f"Successfully sent to connection {i}")
-            except Exception as e:
-                logger.error(f"Failed to send to connection {i}: {e}")
+
+        for i, (connection, result) in enumerate(zip(connections, results)):
+            if isinstance(result, Exception):
+                logger.error("Failed to send to connection %d: %r", i, result)
                 dead_connections.append(connection)
-        
+            else:
+                successful_sends += 1
+                logger.debug("Successfully sent to connection %d", i)
+
         # Remove dead connections
         for dead_conn in dead_connections:
             self.disconnect(dead_conn)
             
-        logger.info(f"Broadcast completed: {successful_sends} successful, {len(dead_connections)} failed")
+        logger.debug("Broadcast completed: %d successful, %d failed", successful_sends, len(dead_connections))
         
         if successful_sends == 0:
             logger.warning("No active WebSocket connections to receive broadcast")
-                
+
+    def enqueue(self, message: bytes):
+        """Queue one JSON-encoded event for dispatch_events(). Call it on the
+        event loop thread, e.g. through loop.call_soon_threadsafe."""
+        self._pending.append(message)
+        self._pending_ready.set()
+
+    async def dispatch_events(self):
+        """Broadcast queued events until cancelled."""
+        while True:
+            await self._pending_ready.wait()
+            self._pending_ready.clear()
+            while self._pending:
+                parts = [self._pending.popleft() for _ in range(len(self._pending))]
+                if len(parts) == 1:
+                    message = parts[0]
+                else:
+                    message = b'{"type":"batch","events":[' + b",".join(parts) + b"]}"
+                try:
+                    await self.broadcast(message)
+                except Exception as e:
+                    logger.error("Failed to broadcast events: %s", e)
+
 manager = ConnectionManager()
@@ -1,5 +1,4 @@
 import threading
-import time
 import json
 from backend.nodes.human import HumanInputNode, pending_requests
 
@@ -28,14 +27,7 @@ def test_hitl_success():
     thread.start()
     
     # 3. Wait for request to appear in pending_requests
-    limit = 10
-    request_id = None
-    while limit > 0:
-        if pending_requests:
-            request_id = list(pending_requests.keys())[0]
-            break
-        time.sleep(0.5)
-        limit -= 1
+    request_id = pending_requests.wait_new(timeout=5)
     
     if not request_id:
         print("FAILED: No request ID generated")
@@ -45,8 +37,7 @@ def test_hitl_success():
     
     # 4. Simulate User Response (Mimic the API endpoint)
     response_data = {"comment": "All good!", "approved": True}
-    pending_requests[request_id]["response"] = response_data
-    pending_requests[request_id]["event"].set()
+    pending_requests.respond(request_id, response_data)
     
     # 5. Wait for node to finish
     thread.join(timeout=5)
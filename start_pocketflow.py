@@ -1,8 +1,11 @@
 import subprocess
 import os
 import sys
-import time
+import queue
 import signal
+import threading
+import time
+import urllib.request
 
 def get_venv_executable(name):
     """Finds an executable inside the virtual environment."""
@@ -18,16 +21,24 @@ def get_venv_executable(name):
         sys.exit(1)
     return path
 
-def start_backend():
+def start_backend(dev=False):
     print("📦 Starting Backend (Port 8000)...")
     uvicorn_path = get_venv_executable("uvicorn")
+    args = [uvicorn_path, "backend.main:app", "--host", "0.0.0.0", "--port", "8000"]
+    # The reloader forks a watcher process and keeps stat()ing the tree, so it
+    # is only worth it while editing the backend. A single worker is kept on
+    # purpose: WebSocket clients, pending HITL requests and the scheduler all
+    # live in process memory.
+    if dev:
+        args += ["--reload", "--reload-dir", "backend"]
+    # libuv's loop and the C HTTP parser speed up the WebSocket broadcast path;
+    # uvloop has no Windows build, where uvicorn's asyncio defaults remain
+    if sys.platform != "win32":
+        args += ["--loop", "uvloop", "--http", "httptools"]
     
     # We execute uvicorn directly from the venv path. 
     # No need for 'source activate' or shell=True
-    return subprocess.Popen(
-        [uvicorn_path, "backend.main:app", "--host", "0.0.0.0", "--port", "8000", "--reload"],
-        cwd=os.getcwd()
-    )
+    return subprocess.Popen(args, cwd=os.getcwd())
 
 def start_frontend():
     print("🎨 Starting Frontend (Vite)...")
@@ -46,6 +57,57 @@ def start_frontend():
         stderr=f
     ), f
 
+def wait_until_ready(url, process, timeout=10.0):
+    """Polls url with exponential backoff until it answers, the process exits
+    or timeout seconds pass. Returns True once the service responds."""
+    deadline = time.monotonic() + timeout
+    delay = 0.05
+    while time.monotonic() < deadline and process.poll() is None:
+        try:
+            with urllib.request.urlopen(url, timeout=1):
+                return True
+        except OSError:
+            pass
+        time.sleep(min(delay, max(0.0, deadline - time.monotonic())))
+        delay = min(delay * 2, 1.0)
+    return False
+
+def wait_for_exit(processes):
+    """Blocks until one of the processes exits and returns its name.
+
+    Ctrl+C (or SIGTERM on POSIX) raises KeyboardInterrupt. Nothing is polled:
+    on POSIX the script sleeps in sigwait until a child exits or a signal
+    arrives, elsewhere a waiter thread per process reports the first exit.
+    """
+    if hasattr(signal, "sigwait"):
+        # Block the signals so they queue up for sigwait instead of being
+        # handled; children were started before this and keep a clean mask
+        signals = {signal.SIGCHLD, signal.SIGINT, signal.SIGTERM}
+        old_mask = signal.pthread_sigmask(signal.SIG_BLOCK, signals)
+        try:
+            while True:
+                # Also catches a child that died before the signals were blocked
+                for name, process in processes.items():
+                    if process.poll() is not None:
+                        return name
+                if signal.sigwait(signals) != signal.SIGCHLD:
+                    raise KeyboardInterrupt
+        finally:
+            signal.pthread_sigmask(signal.SIG_SETMASK, old_mask)
+
+    exited = queue.Queue()
+    for name, process in processes.items():
+        threading.Thread(
+            target=lambda n=name, p=process: (p.wait(), exited.put(n)), daemon=True
+        ).start()
+    while True:
+        try:
+            # The timeout only keeps Ctrl+C responsive on Windows, where a
+            # blocking get() cannot be interrupted; exits are seen immediately
+            return exited.get(timeout=1)
+        except queue.Empty:
+            pass
+
 def main():
     print("🚀 Starting PocketFlow Platform...")
     
@@ -55,21 +117,18 @@ def main():
 
     try:
         # Start processes and store their Popen objects
-        backend_process = start_backend()
+        backend_process = start_backend(dev="--dev" in sys.argv)
         frontend_process, frontend_log_file = start_frontend()
 
-        print("✅ Services are running and the app is available at http://localhost:5173/. Press Ctrl+C to stop.")
+        # Both services boot in parallel; only the announcement waits for the API
+        if wait_until_ready("http://localhost:8000/", backend_process):
+            print("✅ Services are running and the app is available at http://localhost:5173/. Press Ctrl+C to stop.")
+        elif backend_process.poll() is None:
+            print("⚠️  Backend is not answering yet; the app will be at http://localhost:5173/. Press Ctrl+C to stop.")
 
-        # LOOP FOREVER to keep the script running
-        while True:
-            time.sleep(1)
-            # Optional: Check if processes died unexpectedly
-            if backend_process.poll() is not None:
-                print("❌ Backend crashed unexpectedly.")
-                break
-            if frontend_process.poll() is not None:
-                print("❌ Frontend crashed unexpectedly.")
-                break
+        # Sleep until either service exits or the user stops the script
+        crashed = wait_for_exit({"Backend": backend_process, "Frontend": frontend_process})
+        print(f"❌ {crashed} crashed unexpectedly.")
 
     except KeyboardInterrupt:
         print("\n👋 Stopping services...")
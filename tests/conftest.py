@@ -0,0 +1,21 @@
+import os
+import shutil
+import tempfile
+
+_workspaces_root = None
+
+
+def pytest_configure(config):
+    # backend.main builds its WorkspaceManager (and runs the legacy workflow
+    # migration) at import time; point it at a temp dir before any test
+    # module imports it, so the suite never writes to backend/workspaces
+    global _workspaces_root
+    if "WORKSPACES_ROOT" not in os.environ:
+        _workspaces_root = tempfile.mkdtemp(prefix="pocketflow-workspaces-")
+        os.environ["WORKSPACES_ROOT"] = _workspaces_root
+
+
+def pytest_unconfigure(config):
+    if _workspaces_root:
+        os.environ.pop("WORKSPACES_ROOT", None)
+        shutil.rmtree(_workspaces_root, ignore_errors=True)
@@ -1,26 +1,34 @@
 import unittest
-from unittest.mock import MagicMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 import os
+import asyncio
 import base64
+import json
+import tempfile
 from backend.nodes.llm import LLMNode
 
+
+def raw_completion(content):
+    """A raw chat completion response carrying `content` as its JSON body."""
+    body = {"choices": [{"index": 0, "message": {"role": "assistant", "content": content}}]}
+    return MagicMock(content=json.dumps(body).encode())
+
+FAKE_IMAGE_URL = "data:image/jpeg;base64," + base64.b64encode(b"fake_image_content").decode()
+
+
 class TestLLMNodePayload(unittest.TestCase):
     def setUp(self):
-        self.test_image_path = "test_image.txt"
-        with open(self.test_image_path, "wb") as f:
-            f.write(b"fake_image_content")
-
-    def tearDown(self):
-        if os.path.exists(self.test_image_path):
-            os.remove(self.test_image_path)
+        # Clients are cached per config; make each test build its own mock
+        LLMNode._CLIENT_CACHE.clear()
+        # Any existing file will do: _encode_image is patched where it matters
+        self.test_image_path = __file__
 
+    @patch.object(LLMNode, '_encode_image', return_value=FAKE_IMAGE_URL)
     @patch('backend.nodes.llm.openai.OpenAI')
-    def test_image_payload_construction(self, mock_openai):
+    def test_image_payload_construction(self, mock_openai, mock_encode):
         # Setup Mock
         mock_client = MagicMock()
-        mock_completion = MagicMock()
-        mock_completion.choices = [MagicMock(message=MagicMock(content="Image analyzed"))]
-        mock_client.chat.completions.create.return_value = mock_completion
+        mock_client.chat.completions.with_raw_response.create.return_value = raw_completion("Image analyzed")
         mock_openai.return_value = mock_client
 
         # Setup Node
@@ -47,9 +55,10 @@ class TestLLMNodePayload(unittest.TestCase):
         
         # Verification
         self.assertTrue(result["success"])
+        self.assertEqual(result["response"], "Image analyzed")
         
         # Check call arguments
-        call_args = mock_client.chat.completions.create.call_args
+        call_args = mock_client.chat.completions.with_raw_response.create.call_args
         self.assertIsNotNone(call_args)
         
         messages = call_args.kwargs['messages']
@@ -67,17 +76,27 @@ class TestLLMNodePayload(unittest.TestCase):
         self.assertEqual(user_message_content[1]['type'], 'image_url')
         image_url = user_message_content[1]['image_url']['url']
         
-        expected_base64 = base64.b64encode(b"fake_image_content").decode('utf-8')
-        self.assertTrue(image_url.startswith("data:image/jpeg;base64,"))
-        self.assertIn(expected_base64, image_url)
+        self.assertEqual(image_url, FAKE_IMAGE_URL)
+        mock_encode.assert_called_once_with(self.test_image_path)
+
+    def test_encode_image(self):
+        """Test that local images become data URLs and rewritten files are re-read."""
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "image.jpg")
+            with open(path, "wb") as f:
+                f.write(b"fake_image_content")
+            self.assertEqual(LLMNode()._encode_image(path), FAKE_IMAGE_URL)
+
+            with open(path, "wb") as f:
+                f.write(b"other")
+            expected = "data:image/jpeg;base64," + base64.b64encode(b"other").decode()
+            self.assertEqual(LLMNode()._encode_image(path), expected)
 
     @patch('backend.nodes.llm.openai.OpenAI')
     def test_url_payload_construction(self, mock_openai):
         # Setup Mock
         mock_client = MagicMock()
-        mock_completion = MagicMock()
-        mock_completion.choices = [MagicMock(message=MagicMock(content="URL analyzed"))]
-        mock_client.chat.completions.create.return_value = mock_completion
+        mock_client.chat.completions.with_raw_response.create.return_value = raw_completion("URL analyzed")
         mock_openai.return_value = mock_client
 
         # Setup Node
@@ -96,11 +115,107 @@ class TestLLMNodePayload(unittest.TestCase):
         result = node.exec(prep_res)
         
         # Verification
-        messages = mock_client.chat.completions.create.call_args.kwargs['messages']
+        messages = mock_client.chat.completions.with_raw_response.create.call_args.kwargs['messages']
         user_message_content = messages[-1]['content']
         
         self.assertEqual(user_message_content[1]['type'], 'image_url')
         self.assertEqual(user_message_content[1]['image_url']['url'], "http://example.com/image.jpg")
 
+    @patch('backend.nodes.llm.openai.OpenAI')
+    def test_batch_payload_construction(self, mock_openai):
+        # Setup Mock: one completion answering both prompts
+        mock_client = MagicMock()
+        mock_client.chat.completions.with_raw_response.create.return_value = raw_completion("[1] Paris\n[2] Rome")
+        mock_openai.return_value = mock_client
+
+        peers = []
+        for question in ["Capital of France?", "Capital of Italy?"]:
+            node = LLMNode()
+            node.config = {"model": "m", "user_prompt": question, "batch_group": "capitals"}
+            peers.append(node)
+
+        shared = {"results": {}}
+        preps = [node.prep(shared) for node in peers]
+        results = LLMNode.batch_exec(peers, preps)
+
+        # A single request carrying both indexed prompts
+        self.assertEqual(mock_client.chat.completions.with_raw_response.create.call_count, 1)
+        user_message = mock_client.chat.completions.with_raw_response.create.call_args.kwargs['messages'][-1]['content']
+        self.assertIn("[1] Capital of France?", user_message)
+        self.assertIn("[2] Capital of Italy?", user_message)
+
+        self.assertEqual([r["response"] for r in results], ["Paris", "Rome"])
+        self.assertTrue(all(r["success"] for r in results))
+
+    @patch('backend.nodes.llm.openai.OpenAI')
+    def test_stream_emits_tokens(self, mock_openai):
+        # Setup Mock: a stream of delta chunks
+        mock_client = MagicMock()
+        chunks = [MagicMock(choices=[MagicMock(delta=MagicMock(content=text))]) for text in ["Hel", "lo", None]]
+        mock_client.chat.completions.create.return_value = iter(chunks)
+        mock_openai.return_value = mock_client
+
+        node = LLMNode()
+        node.config = {"model": "m", "user_prompt": "Hi", "stream": True}
+        events = []
+        node.on_event = lambda event_type, payload: events.append((event_type, payload))
+
+        result = node.exec(node.prep({"results": {}}))
+
+        self.assertTrue(mock_client.chat.completions.create.call_args.kwargs['stream'])
+        self.assertEqual(result["response"], "Hello")
+        tokens = [payload["delta"] for event_type, payload in events if event_type == "llm_token"]
+        self.assertEqual(tokens, ["Hel", "lo"])
+
+    @patch('backend.nodes.llm.openai.AsyncOpenAI')
+    def test_aexec_many(self, mock_async_openai):
+        # Setup Mock: one async client answering every request
+        mock_client = MagicMock()
+        mock_client.chat.completions.with_raw_response.create = AsyncMock(
+            side_effect=lambda **kwargs: raw_completion("re: " + kwargs['messages'][-1]['content'])
+        )
+        mock_client.close = AsyncMock()
+        mock_async_openai.return_value = mock_client
+
+        nodes = []
+        for question in ["A?", "B?", "C?"]:
+            node = LLMNode()
+            node.config = {"model": "m", "user_prompt": question}
+            nodes.append(node)
+
+        shared = {"results": {}}
+        preps = [node.prep(shared) for node in nodes]
+        results = asyncio.run(LLMNode.aexec_many(nodes, preps, max_concurrency=2))
+
+        self.assertEqual([r["response"] for r in results], ["re: A?", "re: B?", "re: C?"])
+        # Same server config: one client, closed when done
+        self.assertEqual(mock_async_openai.call_count, 1)
+        mock_client.close.assert_awaited_once()
+
+    def test_branch_concurrency_is_opt_in(self):
+        from backend.engine import BranchNode
+
+        def llm(**config):
+            node = LLMNode()
+            node.config = config
+            return node
+
+        self.assertFalse(BranchNode._may_run_concurrently(llm()))
+        self.assertTrue(BranchNode._may_run_concurrently(llm(concurrent=True)))
+        # History turns must land in order, so those nodes stay sequential
+        self.assertFalse(BranchNode._may_run_concurrently(llm(concurrent=True, use_history=True)))
+
+    def test_web_fetch_branch_concurrency_is_opt_in(self):
+        from backend.engine import BranchNode
+        from backend.nodes.web import WebFetchNode
+
+        def fetch(**config):
+            node = WebFetchNode()
+            node.config = config
+            return node
+
+        self.assertFalse(BranchNode._may_run_concurrently(fetch(url="http://a")))
+        self.assertTrue(BranchNode._may_run_concurrently(fetch(url="http://a", concurrent=True)))
+
 if __name__ == '__main__':
     unittest.main()
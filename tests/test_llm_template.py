@@ -0,0 +1,60 @@
+import unittest
+from backend.nodes.llm import _compile_template, _render_template
+
+
+class TestLLMTemplate(unittest.TestCase):
+    def render(self, template, context):
+        return _render_template(_compile_template(template), context)
+
+    def test_substitutes_known_keys(self):
+        """Test that {input} and memory keys (including namespaced ones) are replaced."""
+        context = {"input": "hello", "user.name": "Ada"}
+        self.assertEqual(
+            self.render("Say {input} to {user.name}", context),
+            "Say hello to Ada",
+        )
+
+    def test_complex_values_are_json(self):
+        """Test that dict/list values are rendered as JSON."""
+        context = {"data": {"a": 1}, "items": ["x", "ñ"]}
+        self.assertEqual(
+            self.render("{data} {items}", context),
+            '{"a": 1} ["x", "ñ"]',
+        )
+
+    def test_unknown_placeholders_are_kept(self):
+        """Test that unknown placeholders and literal JSON braces are left untouched."""
+        template = 'Reply as {"answer": "..."} using {missing}'
+        self.assertEqual(self.render(template, {"input": "x"}), template)
+
+    def test_shared_render_cache(self):
+        """Test that a shared cache stringifies a repeated value only once."""
+        calls = []
+
+        class Value:
+            def __str__(self):
+                calls.append(1)
+                return "v"
+
+        context = {"x": Value()}
+        rendered = {}
+        self.assertEqual(_render_template(_compile_template("{x}{x}"), context, rendered), "vv")
+        self.assertEqual(_render_template(_compile_template("img-{x}"), context, rendered), "img-v")
+        self.assertEqual(len(calls), 1)
+
+    def test_unreferenced_values_are_not_serialized(self):
+        """Test that only keys named in the template are stringified."""
+        class Unserializable:
+            def __str__(self):
+                raise AssertionError("unreferenced value was stringified")
+
+        context = {"input": "hi", "big": {"blob": Unserializable()}, "other": Unserializable()}
+        self.assertEqual(self.render("Say {input}", context), "Say hi")
+
+    def test_template_without_placeholders(self):
+        self.assertEqual(self.render("Static prompt", {"input": "x"}), "Static prompt")
+        self.assertEqual(self.render("", {"input": "x"}), "")
+
+
+if __name__ == '__main__':
+    unittest.main()
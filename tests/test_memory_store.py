@@ -0,0 +1,107 @@
+import json
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+from backend.nodes._memory_store import MemoryStore, HistoryStore
+
+
+class TestMemoryStore(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.memory_file = Path(self.tmp.name) / "memory.json"
+        self.history_dir = Path(self.tmp.name) / "history"
+        for name, value in (("MEMORY_FILE", self.memory_file), ("HISTORY_DIR", self.history_dir)):
+            patcher = patch(f"config.{name}", value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.store = MemoryStore()
+        self.addCleanup(self.tmp.cleanup)
+        self.addCleanup(self.store.close)
+
+    def test_flush_writes_file_atomically(self):
+        """Test that writes are held in memory until flush, which replaces the file."""
+        self.store.set("a", 1)
+        self.assertEqual(self.store.read(), {"a": 1})
+        self.store.flush()
+        self.assertEqual(json.loads(self.memory_file.read_text()), {"a": 1})
+        self.assertFalse(self.memory_file.with_name("memory.json.tmp").exists())
+
+    def test_reads_stdlib_nan(self):
+        """Test that NaN/Infinity written by json.dump still load."""
+        self.memory_file.write_text(json.dumps({"score": float("nan"), "k": 1}))
+        data = self.store.read()
+        self.assertEqual(data["k"], 1)
+        self.assertNotEqual(data["score"], data["score"])
+
+    def test_set_does_not_alias_caller_value(self):
+        """Test that mutating a value after set() does not reach the file."""
+        value = [1]
+        self.store.set("k", value)
+        value.append("2")
+        self.store.set("other", 1)
+        self.store.flush()
+        self.assertEqual(json.loads(self.memory_file.read_text()), {"k": [1], "other": 1})
+
+    def test_append_uses_sidecar(self):
+        """Test that appended lists survive a reload and stay out of the main file."""
+        self.store.set("log", ["x"])
+        self.assertEqual(self.store.append("log", "y"), ["x", "y"])
+        self.store.close()
+
+        self.assertEqual(json.loads(self.memory_file.read_text()), {})
+        self.assertEqual(MemoryStore().read(), {"log": ["x", "y"]})
+
+    def test_append_returns_live_list(self):
+        """Test that append hands back the stored list instead of a copy."""
+        first = self.store.append("log", "x")
+        self.assertIs(self.store.append("log", "y"), first)
+        self.assertTrue(self.store.holds("log", first))
+        self.assertFalse(self.store.holds("log", list(first)))
+
+    def test_append_does_not_rewrite_main_file(self):
+        """Test that appends to an existing sidecar leave the main file alone."""
+        self.store.set("a", 1)
+        self.store.append("log", "x")
+        self.store.flush()
+        stamp = self.memory_file.stat().st_mtime_ns
+
+        with patch("backend.nodes._memory_store._atomic_write") as atomic_write:
+            self.store.append("log", "y")
+            self.store.flush()
+        atomic_write.assert_not_called()
+        self.assertEqual(self.memory_file.stat().st_mtime_ns, stamp)
+        self.assertEqual(MemoryStore().read(), {"a": 1, "log": ["x", "y"]})
+
+    def test_delete(self):
+        """Test that deleting removes both plain keys and sidecar lists."""
+        self.store.set("a", 1)
+        self.store.append("log", "x")
+        self.assertTrue(self.store.delete("a"))
+        self.assertTrue(self.store.delete("log"))
+        self.assertFalse(self.store.delete("a"))
+        self.store.close()
+        self.assertEqual(MemoryStore().read(), {})
+
+    def test_history_is_sharded_per_conversation(self):
+        """Test that each conversation is saved to its own file."""
+        history = HistoryStore(self.store)
+        history.set("chat/1", [{"role": "user", "content": "hi"}])
+        history.set("other", [])
+        history.flush()
+
+        self.assertEqual(sorted(p.name for p in self.history_dir.iterdir()), ["chat%2F1.json", "other.json"])
+        self.assertEqual(HistoryStore(self.store).get("chat/1"), [{"role": "user", "content": "hi"}])
+
+    def test_legacy_history_is_migrated(self):
+        """Test that "_chat_history_<id>" keys move out of the memory file."""
+        self.memory_file.write_text(json.dumps({"_chat_history_c": [{"role": "user", "content": "x"}], "k": 1}))
+
+        history = HistoryStore(self.store)
+        self.assertEqual(history.get("c"), [{"role": "user", "content": "x"}])
+        self.assertTrue((self.history_dir / "c.json").exists())
+        self.assertEqual(self.store.read(), {"k": 1})
+
+
+if __name__ == "__main__":
+    unittest.main()
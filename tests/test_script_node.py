@@ -0,0 +1,61 @@
+import unittest
+from unittest.mock import patch
+from backend.nodes import script
+from backend.nodes.script import ScriptNode
+
+
+def run_bash(body, input_val="", input_mode="stdin", return_type="json"):
+    node = ScriptNode()
+    return node.exec({
+        "interpreter": "bash",
+        "script_body": body,
+        "input_mode": input_mode,
+        "return_type": return_type,
+        "sandbox_mode": "auto",
+        "input_val": input_val,
+    })
+
+
+class TestBashWorker(unittest.TestCase):
+    def tearDown(self):
+        script._close_bash_workers()
+
+    def test_exit_codes_and_streams(self):
+        """Test that stdout, stderr and the exit code of each run are kept apart."""
+        result = run_bash("echo out; echo err >&2; exit 3")
+        self.assertEqual(result, {"stdout": "out", "stderr": "err", "exit_code": 3, "success": False})
+        self.assertEqual(run_bash("true", return_type="exit_code"), 0)
+
+    def test_input_modes(self):
+        """Test stdin, env and none input modes."""
+        text = "a b\n\n c\n"
+        self.assertEqual(run_bash("cat", text)["stdout"], text.strip())
+        self.assertEqual(run_bash('printf "%s" "$POCKETFLOW_INPUT"', text, "env")["stdout"], text.strip())
+        self.assertEqual(run_bash("cat; echo ${POCKETFLOW_INPUT-unset}", text, "none")["stdout"], "unset")
+
+    def test_runs_are_isolated(self):
+        """Test that state and worker variables do not leak into scripts."""
+        run_bash("cd /; X=1")
+        self.assertEqual(run_bash("echo ${X-unset}")["stdout"], "unset")
+        result = run_bash('echo "${__pf_script-}${__pf_mode-}${__PF_TOKEN-}${__PF_DIR-}"', "x", "none")
+        self.assertEqual(result["stdout"], "")
+
+    def test_timeout_replaces_worker(self):
+        """Test that a timed-out worker is killed and the next run gets a new one."""
+        with patch.object(script, "SCRIPT_TIMEOUT", 0.5):
+            self.assertIn("timed out", run_bash("sleep 5"))
+        self.assertEqual(script._idle_bash_workers, [])
+        self.assertEqual(run_bash("echo ok")["stdout"], "ok")
+
+    def test_dead_worker_is_respawned(self):
+        """Test that a worker that died, idle or mid-run, is not reused."""
+        run_bash("true")
+        script._idle_bash_workers[0].kill()
+        self.assertEqual(run_bash("echo ok")["stdout"], "ok")
+
+        self.assertIn("exited unexpectedly", run_bash("kill -9 $$"))
+        self.assertEqual(run_bash("echo ok")["stdout"], "ok")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,55 @@
+import unittest
+from unittest.mock import MagicMock, patch
+from backend.engine import run_flow
+from backend.nodes.vector_memory import VectorMemoryNode
+
+
+def buffer_add(shared):
+    """Buffer one document the way a batch_size > 1 add does."""
+    shared[VectorMemoryNode.PENDING_KEY] = {
+        ("main", (None, "m", 5, 0)): {"documents": ["doc"], "metadatas": [None], "ids": ["id1"]}
+    }
+
+
+class TestPendingFlush(unittest.TestCase):
+    def setUp(self):
+        self.client = MagicMock()
+        patcher = patch.object(VectorMemoryNode, "_get_client", return_value=self.client)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_failed_flush_keeps_batch(self):
+        """Test that a failed add is re-raised and the batch stays buffered."""
+        self.client.get_or_create_collection.return_value.add.side_effect = RuntimeError("down")
+        shared = {}
+        buffer_add(shared)
+
+        with self.assertRaises(RuntimeError):
+            VectorMemoryNode.flush_pending(shared)
+        self.assertEqual(len(shared[VectorMemoryNode.PENDING_KEY]), 1)
+
+    def test_run_flow_fails_on_deferred_flush_error(self):
+        """Test that run_flow reports a failed end-of-run flush."""
+        self.client.get_or_create_collection.return_value.add.side_effect = RuntimeError("down")
+        flow = MagicMock()
+        flow.run.side_effect = buffer_add
+
+        with self.assertRaises(RuntimeError):
+            run_flow(flow, {})
+
+    def test_run_flow_flushes_at_end(self):
+        """Test that buffered adds are sent once the run ends."""
+        flow = MagicMock()
+        flow.run.side_effect = buffer_add
+        shared = {}
+
+        run_flow(flow, shared)
+        self.client.get_or_create_collection.return_value.add.assert_called_once_with(
+            documents=["doc"], metadatas=[None], ids=["id1"]
+        )
+        self.assertEqual(shared[VectorMemoryNode.PENDING_KEY], {})
+        self.assertNotIn(VectorMemoryNode.DEFER_FLUSH_KEY, shared)
+
+
+if __name__ == "__main__":
+    unittest.main()
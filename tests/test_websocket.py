@@ -1,7 +1,7 @@
 #!/usr/bin/env python3
 import asyncio
 import websockets
-import json
+from backend.nodes import _json
 
 
 async def test_websocket():
@@ -9,7 +9,9 @@ async def test_websocket():
     print(f"Connecting to {uri}...")
 
     try:
-        async with websockets.connect(uri) as websocket:
+        # Batch frames are repetitive JSON and compress well; they can also
+        # outgrow the client's default 1 MiB frame limit
+        async with websockets.connect(uri, compression="deflate", max_size=8 * 1024 * 1024) as websocket:
             print("Connected to WebSocket!")
 
             # Listen for messages
@@ -17,9 +19,12 @@ async def test_websocket():
                 try:
                     message = await websocket.recv()
                     try:
-                        data = json.loads(message)
-                        print(f"Received: {data['type']} - {data.get('payload', {})}")
-                    except json.JSONDecodeError as e:
+                        data = _json.loads(message)
+                        # Events raised close together arrive as one "batch" frame
+                        events = data["events"] if data["type"] == "batch" else [data]
+                        for event in events:
+                            print(f"Received: {event['type']} - {event.get('payload', {})}")
+                    except _json.JSONDecodeError as e:
                         print(f"Invalid JSON received: {message} - Error: {e}")
                 except websockets.exceptions.ConnectionClosed:
                     print("WebSocket connection closed")
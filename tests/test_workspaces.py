@@ -1,26 +1,34 @@
 import pytest
 from fastapi.testclient import TestClient
+from backend import main
 from backend.main import app
-import os
-import shutil
+from backend.scheduler import SchedulerService
+from backend.workspace_manager import WorkspaceManager
 
-client = TestClient(app)
+@pytest.fixture(scope="session")
+def client():
+    # One client for the whole run. Not entered as a context manager, so the
+    # app's startup hooks (scheduler, event dispatcher) stay off in tests.
+    return TestClient(app)
 
-@pytest.fixture
-def clean_workspaces():
-    # Setup
-    yield
-    # Teardown: Remove test workspaces
-    if os.path.exists("backend/workspaces/test_ws"):
-        shutil.rmtree("backend/workspaces/test_ws")
+@pytest.fixture(autouse=True)
+def workspaces_root(tmp_path, monkeypatch):
+    # Each test gets its own workspaces root under tmp_path, so tests cannot
+    # see each other's workspaces (importing backend.main itself uses the
+    # WORKSPACES_ROOT set in conftest.py)
+    root = tmp_path / "workspaces"
+    manager = WorkspaceManager(str(tmp_path), str(root))
+    monkeypatch.setattr(main, "workspace_manager", manager)
+    monkeypatch.setattr(main, "scheduler", SchedulerService(manager.get_workflows_dir("default")))
+    return root
 
-def test_list_workspaces():
+def test_list_workspaces(client):
     response = client.get("/api/workspaces")
     assert response.status_code == 200
     workspaces = response.json()
     assert "default" in workspaces
 
-def test_create_and_switch_workspace(clean_workspaces):
+def test_create_and_switch_workspace(client):
     # Create
     response = client.post("/api/workspaces", json={"name": "test_ws"})
     assert response.status_code == 200
@@ -33,6 +41,7 @@ def test_create_and_switch_workspace(clean_workspaces):
     # Switch
     response = client.post("/api/workspaces/active", json={"name": "test_ws"})
     assert response.status_code == 200
+    assert response.json()["name"] == "test_ws"
     
     # Verify active
     response = client.get("/api/workspaces/active")
@@ -41,7 +50,7 @@ def test_create_and_switch_workspace(clean_workspaces):
     # Switch back to default
     client.post("/api/workspaces/active", json={"name": "default"})
 
-def test_workflow_isolation(clean_workspaces):
+def test_workflow_isolation(client):
     # 1. Ensure we are in default
     client.post("/api/workspaces/active", json={"name": "default"})
     
@@ -53,8 +62,8 @@ def test_workflow_isolation(clean_workspaces):
     client.post("/api/workflows/wf_default", json=wf_data)
     
     # 3. Create and switch to new workspace
-    client.post("/api/workspaces", json={"name": "test_ws"})
-    client.post("/api/workspaces/active", json={"name": "test_ws"})
+    response = client.post("/api/workspaces?activate=true", json={"name": "test_ws"})
+    assert response.json()["active"] == "test_ws"
     
     # 4. List workflows - should be empty (excluding migrated if any, but test_ws should be empty)
     response = client.get("/api/workflows")
@@ -73,7 +82,7 @@ def test_workflow_isolation(clean_workspaces):
     assert "wf_default" in workflows
     assert "wf_test" not in workflows
 
-def test_delete_workspace(clean_workspaces):
+def test_delete_workspace(client):
     # Create
     client.post("/api/workspaces", json={"name": "test_del"})
     